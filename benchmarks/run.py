@@ -0,0 +1,294 @@
+"""
+Benchmark suite for the ETL stages and the machine learning models.
+
+Each stage runs over synthetic sources (see `benchmarks.synthetic`) and records
+wall time and peak memory. Results are written to a JSON file, so runs from
+different commits can be compared with `--compare`.
+
+Usage:
+    python -m benchmarks.run --rows 10000 100000 --output bench.json
+    python -m benchmarks.run --rows 10000 --output new.json --compare bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional
+
+from model.registry import MODELS, load_model
+
+
+CBR_QUERIES = 100
+
+
+def measure(name: str,
+            rows: int,
+            stage: Callable[[], Any],
+            repeat: int = 1,
+            track_memory: bool = True) -> tuple[dict, Any]:
+    """
+    Times a stage and measures its peak memory.
+    The wall time is the best of `repeat` runs; peak memory is measured in an
+    extra run, since tracing allocations slows the stage down.
+
+    Args:
+        name (str): The benchmark name.
+        rows (int): The number of input rows of the stage.
+        stage (Callable[[], Any]): The stage to run.
+        repeat (int): The number of timed runs.
+        track_memory (bool): Whether to measure the peak memory.
+
+    Returns:
+        tuple[dict, Any]: The benchmark record and the result of the last run.
+    """
+    timings = []
+    result = None
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = stage()
+        timings.append(time.perf_counter() - start)
+
+    peak_memory_mb = None
+
+    if track_memory:
+        tracemalloc.start()
+        stage()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_memory_mb = peak / 1024 ** 2
+
+    record = {
+        "benchmark": name,
+        "rows": rows,
+        "seconds": min(timings),
+        "peak_memory_mb": peak_memory_mb,
+    }
+
+    print(f"{name:<28} {rows:>10} rows {record['seconds']:>10.3f}s"
+          + ("" if peak_memory_mb is None else f" {peak_memory_mb:>10.1f} MB"))
+
+    return record, result
+
+
+def run_scale(rows: int, workdir: str, args: argparse.Namespace) -> list[dict]:
+    """
+    Generates synthetic sources with `rows` rows and benchmarks every stage over them.
+    """
+    import pandas as pd
+    from benchmarks.synthetic import generate
+    from data.constants.dataset_constants import OSC_DATASET, PROJECTS_DATASET
+    from data.processing.data_parser import to_utf8
+    from data.processing.features import (CBR_CATEGORICAL_COLS, CBR_NUMERIC_COLS,
+                                          CBR_SET_COLS, CBR_TARGET_COL, cbr_dataset,
+                                          classifier_features)
+    from data.processing.text_features import project_texts, text_features
+    from data.processing.osc import osc_dataset
+    from data.processing.projects import projects_dataset
+    from data.processing.validation import OSC_RULES, PROJECTS_RULES, validate
+    from model.case_base_reasoning_model import CaseBasedReasoning
+    from model.weighted_case_base_reasoning_model import WeightedCaseBasedReasoning
+
+    generate(rows, rows, workdir, args.seed)
+    options = {"repeat": args.repeat, "track_memory": not args.no_memory}
+    records = []
+
+    # cold runs parse the sources; warm runs load the cached intermediates
+    record, osc_source_path = measure("to_utf8[osc]", rows,
+                                      lambda: to_utf8(OSC_DATASET, ";", "latin1", use_cache=False),
+                                      **options)
+    records.append(record)
+
+    record, projects_source_path = measure("to_utf8[projects]", rows,
+                                           lambda: to_utf8(PROJECTS_DATASET, use_cache=False),
+                                           **options)
+    records.append(record)
+
+    to_utf8(OSC_DATASET, ";", "latin1")
+    to_utf8(PROJECTS_DATASET)
+
+    record, _ = measure("to_utf8[osc,cached]", rows,
+                        lambda: to_utf8(OSC_DATASET, ";", "latin1"),
+                        **options)
+    records.append(record)
+
+    record, _ = measure("to_utf8[projects,cached]", rows,
+                        lambda: to_utf8(PROJECTS_DATASET),
+                        **options)
+    records.append(record)
+
+    osc_source = pd.read_csv(osc_source_path, sep=";", dtype=str)
+    projects_source = pd.read_csv(projects_source_path, sep=";", dtype=str)
+
+    record, _ = measure("validate[osc]", len(osc_source),
+                        lambda: validate(osc_source, OSC_RULES),
+                        **options)
+    records.append(record)
+
+    record, _ = measure("validate[projects]", len(projects_source),
+                        lambda: validate(projects_source, PROJECTS_RULES),
+                        **options)
+    records.append(record)
+
+    record, osc_df = measure("osc_dataset", len(osc_source),
+                             lambda: osc_dataset(osc_source, args.workers),
+                             **options)
+    records.append(record)
+
+    record, projects_df = measure("projects_dataset", len(projects_source),
+                                  lambda: projects_dataset(projects_source, osc_df, args.workers),
+                                  **options)
+    records.append(record)
+
+    if projects_df is None:
+        print("No projects left after filtering; skipping model benchmarks.")
+        return records
+
+    cases = cbr_dataset(projects_df, osc_df)
+    rbc = CaseBasedReasoning(data=cases,
+                             categorical_cols=CBR_CATEGORICAL_COLS,
+                             numeric_cols=CBR_NUMERIC_COLS,
+                             target_col=CBR_TARGET_COL)
+
+    record, _ = measure("cbr.preprocess", len(cases), rbc.preprocess, **options)
+    records.append(record)
+
+    queries = [cases.iloc[i % len(cases)].to_dict() for i in range(CBR_QUERIES)]
+
+    record, _ = measure(f"cbr.predict[x{CBR_QUERIES}]", len(cases),
+                        lambda: [rbc.predict(query, k=3) for query in queries],
+                        **options)
+    records.append(record)
+
+    weighted_rbc = WeightedCaseBasedReasoning(data=cases,
+                                              categorical_cols=CBR_CATEGORICAL_COLS,
+                                              numeric_cols=CBR_NUMERIC_COLS,
+                                              target_col=CBR_TARGET_COL,
+                                              set_cols=CBR_SET_COLS)
+
+    record, _ = measure("weighted_cbr.preprocess", len(cases), weighted_rbc.preprocess, **options)
+    records.append(record)
+
+    record, _ = measure(f"weighted_cbr.predict[x{CBR_QUERIES}]", len(cases),
+                        lambda: [weighted_rbc.predict(query, k=3) for query in queries],
+                        **options)
+    records.append(record)
+
+    texts = project_texts(projects_df)
+
+    record, _ = measure("text_features", len(texts),
+                        lambda: text_features(texts, workers=args.workers),
+                        **options)
+    records.append(record)
+
+    X, y = classifier_features(projects_df)
+    X, y = X.iloc[:args.max_train_rows], y.iloc[:args.max_train_rows]
+
+    for name in args.models:
+        def train():
+            model = load_model(name)
+            model.X, model.y = X, y
+            model.train()
+
+        record, _ = measure(f"train[{name}]", len(X), train, **options)
+        records.append(record)
+
+    return records
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                              capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: list[dict], baseline_path: str) -> None:
+    """
+    Prints the time and memory ratios between the current results and a previous results file.
+    Ratios above 1 mean the current run is slower or uses more memory.
+    """
+    with open(baseline_path, encoding="utf-8") as baseline_file:
+        baseline = json.load(baseline_file)
+
+    previous = {(entry["benchmark"], entry["rows"]): entry
+                for entry in baseline["results"]}
+
+    print(f"\nComparison with {baseline_path} ({baseline.get('revision')}):")
+
+    for entry in results:
+        old = previous.get((entry["benchmark"], entry["rows"]))
+
+        if old is None:
+            continue
+
+        time_ratio = entry["seconds"] / old["seconds"] if old["seconds"] else float("nan")
+        line = f"{entry['benchmark']:<28} {entry['rows']:>10} rows  time x{time_ratio:.2f}"
+
+        if entry["peak_memory_mb"] and old.get("peak_memory_mb"):
+            line += f"  memory x{entry['peak_memory_mb'] / old['peak_memory_mb']:.2f}"
+
+        print(line)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks do ETL e dos modelos.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000],
+                        help="Escalas (número de linhas) das bases sintéticas.")
+    parser.add_argument("--output", default="bench.json",
+                        help="Arquivo JSON onde os resultados serão salvos.")
+    parser.add_argument("--compare", default=None,
+                        help="Arquivo JSON de uma execução anterior, para comparação.")
+    parser.add_argument("--models", nargs="*", choices=list(MODELS), default=list(MODELS))
+    parser.add_argument("--max-train-rows", type=int, default=50_000,
+                        help="Limite de linhas usadas no treino dos modelos.")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--no-memory", action="store_true",
+                        help="Não mede o pico de memória (evita uma execução extra).")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workdir", default=None,
+                        help="Diretório das bases sintéticas. Por padrão, um diretório temporário.")
+    args = parser.parse_args(argv)
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="mao-amiga-bench-")
+    # must be set before any `data` module is imported
+    os.environ["MAO_AMIGA_DATASET_DIR"] = os.path.join(os.path.abspath(workdir), "")
+
+    results = []
+
+    for rows in args.rows:
+        results.extend(run_scale(rows, workdir, args))
+
+    report = {
+        "revision": git_revision(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "workers": args.workers,
+        "seed": args.seed,
+        "results": results,
+    }
+
+    with open(args.output, "w", encoding="utf-8") as output:
+        json.dump(report, output, indent=2)
+
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
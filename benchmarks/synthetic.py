@@ -0,0 +1,275 @@
+"""
+Seeded generator of synthetic Mapa OSC sources.
+
+The generated files follow `OngsDatasetCols` and `ProjectsDatasetCols`, use the
+same formats as the IPEA exports (OSC file in latin1 with ";" separator, projects
+file in UTF-8 with "," separator) and include malformed lines, which `to_utf8` skips.
+
+Usage:
+    python -m benchmarks.synthetic --osc-rows 100000 --projects-rows 100000 --output-dir ../datasets/
+"""
+import argparse
+import os
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+from data.constants.dataset_constants import OSC_DATASET, PROJECTS_DATASET
+from data.constants.raw_data_constants import OngsDatasetCols, ProjectsDatasetCols
+
+
+WRITE_CHUNK_SIZE = 500_000
+BAD_LINE_RATE = 0.001
+
+UFS = np.array(["DF", "SP", "RJ", "MG", "BA", "GO", "PE", "RS"])
+UF_WEIGHTS = np.array([0.3, 0.2, 0.1, 0.1, 0.1, 0.1, 0.05, 0.05])
+MUNICIPIOS = {
+    "DF": ["Brasília", "Gama", "Taguatinga", "Ceilândia", "Sobradinho"],
+    "SP": ["São Paulo", "Campinas", "Ribeirão Preto", "Santos"],
+    "RJ": ["Rio de Janeiro", "Niterói", "Petrópolis"],
+    "MG": ["Belo Horizonte", "Uberlândia", "Juiz de Fora"],
+    "BA": ["Salvador", "Feira de Santana", "Ilhéus"],
+    "GO": ["Goiânia", "Anápolis", "Luziânia"],
+    "PE": ["Recife", "Olinda", "Caruaru"],
+    "RS": ["Porto Alegre", "Pelotas", "Caxias do Sul"],
+}
+NAME_PREFIXES = np.array(["Associação", "Instituto", "Fundação", "Centro Comunitário", "Obra Social"])
+NAME_SUFFIXES = np.array(["São João", "Esperança", "Mão Amiga", "Criança Feliz", "Solidariedade"])
+PROJECT_THEMES = np.array(["Educação", "Saúde", "Alimentação", "Esporte", "Cultura", "Capacitação"])
+
+
+def cnpj_check_digits(base: np.ndarray) -> np.ndarray:
+    """
+    Computes the two CNPJ check digits for an array of 12-digit bases.
+
+    Args:
+        base (np.ndarray): An (n, 12) array of digits.
+
+    Returns:
+        np.ndarray: An (n, 2) array with the check digits.
+    """
+    first_weights = np.array([5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2])
+    second_weights = np.array([6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2])
+
+    def digit(values: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        remainder = (values * weights).sum(axis=1) % 11
+
+        return np.where(remainder < 2, 0, 11 - remainder)
+
+    first = digit(base, first_weights)
+    second = digit(np.column_stack([base, first]), second_weights)
+
+    return np.column_stack([first, second])
+
+
+def random_cnpjs(rng: np.random.Generator,
+                 rows: int,
+                 invalid_rate: float = 0.01) -> np.ndarray:
+    """
+    Generates raw CNPJs as the source provides them: digits only, without leading zeros.
+    A fraction of them gets wrong check digits.
+
+    Args:
+        rng (np.random.Generator): The seeded random generator.
+        rows (int): The number of CNPJs.
+        invalid_rate (float): The fraction of CNPJs with invalid check digits.
+
+    Returns:
+        np.ndarray: The CNPJs, as strings.
+    """
+    base = rng.integers(0, 10, size=(rows, 12))
+    check = cnpj_check_digits(base)
+    invalid = rng.random(rows) < invalid_rate
+    check[invalid, 1] = (check[invalid, 1] + 1) % 10
+
+    digits = np.column_stack([base, check])
+    numbers = (digits * (10 ** np.arange(13, -1, -1, dtype=np.int64))).sum(axis=1)
+
+    return numbers.astype(str)
+
+
+def random_dates(rng: np.random.Generator,
+                 rows: int,
+                 start: str,
+                 end: str,
+                 missing_rate: float) -> np.ndarray:
+    """
+    Generates ISO dates between `start` and `end`, with a fraction of empty values.
+    """
+    first_day = np.datetime64(start, "D")
+    span = (np.datetime64(end, "D") - first_day).astype(int)
+    dates = (first_day + rng.integers(0, span, size=rows)).astype(str).astype(object)
+    dates[rng.random(rows) < missing_rate] = ""
+
+    return dates
+
+
+def osc_chunk(rng: np.random.Generator, start: int, rows: int) -> pd.DataFrame:
+    """
+    Generates a chunk of the raw OSC dataset.
+
+    Args:
+        rng (np.random.Generator): The seeded random generator.
+        start (int): The index of the first row of the chunk.
+        rows (int): The number of rows in the chunk.
+
+    Returns:
+        pd.DataFrame: The chunk, with every column of `OngsDatasetCols`.
+    """
+    columns = [value for key, value in vars(OngsDatasetCols).items() if key.isupper()]
+    ufs = rng.choice(UFS, size=rows, p=UF_WEIGHTS)
+    municipios = np.empty(rows, dtype=object)
+
+    for uf, uf_municipios in MUNICIPIOS.items():
+        in_uf = ufs == uf
+        municipios[in_uf] = rng.choice(uf_municipios, size=in_uf.sum())
+
+    names = np.char.add(np.char.add(rng.choice(NAME_PREFIXES, size=rows), " "),
+                        rng.choice(NAME_SUFFIXES, size=rows))
+
+    chunk = pd.DataFrame("", index=range(rows), columns=columns)
+    chunk[OngsDatasetCols.CNPJ] = random_cnpjs(rng, rows)
+    chunk[OngsDatasetCols.TX_RAZAO_SOCIAL_OSC] = np.char.add(names, (start + np.arange(rows)).astype(str))
+    chunk[OngsDatasetCols.DT_FUNDACAO_OSC] = random_dates(rng, rows, "1950-01-01", "2024-12-31", 0.1)
+    chunk[OngsDatasetCols.SITUACAO_CADASTRAL] = rng.choice(["Ativa", "Baixada", "Inapta"], size=rows)
+    chunk[OngsDatasetCols.MUNICIPIO_NOME] = municipios
+    chunk[OngsDatasetCols.UF_SIGLA] = ufs
+
+    for column in columns:
+        if column.startswith("Area_") or column.startswith("SubArea_"):
+            chunk[column] = (rng.random(rows) < 0.2).astype(int).astype(str)
+
+    return chunk
+
+
+def projects_chunk(rng: np.random.Generator,
+                   start: int,
+                   rows: int,
+                   osc_cnpjs: np.ndarray) -> pd.DataFrame:
+    """
+    Generates a chunk of the raw projects dataset. Projects reference the generated OSCs
+    and include duplicated IDs, missing dates and missing amounts.
+
+    Args:
+        rng (np.random.Generator): The seeded random generator.
+        start (int): The index of the first row of the chunk.
+        rows (int): The number of rows in the chunk.
+        osc_cnpjs (np.ndarray): The CNPJs of the generated OSC dataset.
+
+    Returns:
+        pd.DataFrame: The chunk, with every column of `ProjectsDatasetCols`.
+    """
+    columns = [value for key, value in vars(ProjectsDatasetCols).items() if key.isupper()]
+    ids = start + np.arange(rows)
+    duplicated = rng.random(rows) < 0.02
+    ids[duplicated] = np.maximum(ids[duplicated] - 1, 0)
+    themes = rng.choice(PROJECT_THEMES, size=rows)
+
+    total = np.round(rng.lognormal(10.5, 1.5, size=rows), 2)
+    collected = np.round(total * rng.random(rows), 2)
+    beneficiaries = rng.integers(0, 5000, size=rows)
+
+    def with_missing(values: np.ndarray, rate: float) -> np.ndarray:
+        result = values.astype(str).astype(object)
+        result[rng.random(rows) < rate] = ""
+
+        return result
+
+    chunk = pd.DataFrame("", index=range(rows), columns=columns)
+    chunk[ProjectsDatasetCols.ID_PROJETO] = ids.astype(str)
+    chunk[ProjectsDatasetCols.CD_IDENTIFICADOR_OSC] = rng.choice(osc_cnpjs, size=rows)
+    chunk[ProjectsDatasetCols.TX_NOME_PROJETO] = np.char.add("Projeto de ", themes)
+    chunk[ProjectsDatasetCols.TX_DESCRICAO_PROJETO] = np.char.add(
+        "Ações de ", np.char.add(themes, " para a comunidade atendida pela organização"))
+    chunk[ProjectsDatasetCols.DT_DATA_INICIO_PROJETO] = random_dates(rng, rows, "2010-01-01", "2025-06-30", 0.1)
+    chunk[ProjectsDatasetCols.DT_DATA_FIM_PROJETO] = random_dates(rng, rows, "2012-01-01", "2030-12-31", 0.3)
+    chunk[ProjectsDatasetCols.NR_TOTAL_BENEFICIARIOS] = with_missing(beneficiaries, 0.2)
+    chunk[ProjectsDatasetCols.NR_VALOR_CAPTADO_PROJETO] = with_missing(collected, 0.3)
+    chunk[ProjectsDatasetCols.NR_VALOR_TOTAL_PROJETO] = with_missing(total, 0.1)
+
+    return chunk
+
+
+def bad_lines(rng: np.random.Generator, rows: int, separator: str, width: int) -> list[str]:
+    """
+    Generates malformed lines, with more fields than the header.
+    """
+    count = int(rng.binomial(rows, BAD_LINE_RATE))
+
+    return [separator.join(["linha inválida"] * (width + 3)) + "\n" for _ in range(count)]
+
+
+def write_chunks(path: str,
+                 chunks,
+                 separator: str,
+                 encoding: str,
+                 rng: np.random.Generator) -> None:
+    with open(path, "w", encoding=encoding, newline="") as output:
+        for index, chunk in enumerate(chunks):
+            chunk.to_csv(output, sep=separator, index=False, header=index == 0)
+            output.writelines(bad_lines(rng, len(chunk), separator, len(chunk.columns)))
+
+
+def generate(osc_rows: int,
+             projects_rows: int,
+             output_dir: str,
+             seed: int = 42) -> tuple[str, str]:
+    """
+    Writes synthetic OSC and projects sources into `output_dir`, using the
+    filenames expected by the ETL (`OSC_DATASET` and `PROJECTS_DATASET`).
+
+    Args:
+        osc_rows (int): The number of OSC rows.
+        projects_rows (int): The number of project rows.
+        output_dir (str): The directory where the files are written.
+        seed (int): The random seed. The same seed always generates the same files.
+
+    Returns:
+        tuple[str, str]: The paths of the OSC and projects files.
+    """
+    rng = np.random.default_rng(seed)
+    os.makedirs(output_dir, exist_ok=True)
+
+    osc_path = os.path.join(output_dir, OSC_DATASET)
+    projects_path = os.path.join(output_dir, PROJECTS_DATASET)
+    osc_cnpjs: list[np.ndarray] = []
+
+    def osc_chunks():
+        for start in range(0, osc_rows, WRITE_CHUNK_SIZE):
+            chunk = osc_chunk(rng, start, min(WRITE_CHUNK_SIZE, osc_rows - start))
+            osc_cnpjs.append(chunk[OngsDatasetCols.CNPJ].to_numpy())
+            yield chunk
+
+    write_chunks(osc_path, osc_chunks(), ";", "latin1", rng)
+
+    all_cnpjs = np.concatenate(osc_cnpjs)
+
+    def projects_chunks():
+        for start in range(0, projects_rows, WRITE_CHUNK_SIZE):
+            yield projects_chunk(rng, start,
+                                 min(WRITE_CHUNK_SIZE, projects_rows - start),
+                                 all_cnpjs)
+
+    write_chunks(projects_path, projects_chunks(), ",", "utf-8", rng)
+
+    return osc_path, projects_path
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Gera bases sintéticas do Mapa OSC.")
+    parser.add_argument("--osc-rows", type=int, default=10_000)
+    parser.add_argument("--projects-rows", type=int, default=10_000)
+    parser.add_argument("--output-dir", required=True)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    osc_path, projects_path = generate(args.osc_rows, args.projects_rows,
+                                       args.output_dir, args.seed)
+    print(f"OSC source: {osc_path}")
+    print(f"Projects source: {projects_path}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,275 @@
+"""
+Command-line entry point for the ETL and the machine learning models.
+
+Usage:
+    python cli.py etl [--workers N]
+    python cli.py train [--model NAME] [--output-dir DIR]
+    python cli.py evaluate [--model NAME]
+    python cli.py run [--from STAGE | --only STAGE]
+    python cli.py predict-cbr --areas "Educação e Pesquisa" --uf DF --municipio Brasília --valor 75000
+
+Heavy modules (pandas, sklearn, matplotlib) are imported only inside the
+subcommand that needs them, so `--help` starts without loading them.
+"""
+import argparse
+import os
+import sys
+from typing import Optional
+
+from data.constants.dataset_constants import OSC_DATASET, PROJECTS_DATASET
+from model.registry import MODELS, check_text_options, load_model
+
+
+def selected_models(name: str) -> list[str]:
+    return list(MODELS) if name == "all" else [name]
+
+
+def trained_models(model_name: str,
+                   text_features: bool = False,
+                   text_components: Optional[int] = None,
+                   text_n_features: Optional[int] = None):
+    """
+    Trains the selected models on the processed projects dataset.
+
+    Args:
+        model_name (str): A key of `MODELS`, or "all".
+        text_features (bool): Whether to add hashed features from the project names and descriptions.
+        text_components (Optional[int]): Reduces the text features to this many dimensions,
+            fitted with each model on its training split.
+        text_n_features (Optional[int]): The number of hash buckets for the texts, shared by
+            the features and the text reduction. Defaults to `DEFAULT_N_FEATURES`.
+
+    Returns:
+        list[tuple[str, MachineLearningModel]]: The trained models, by name.
+    """
+    from data.processing.data_parser import read_dataset
+    from data.processing.features import classifier_features, text_classifier_features
+    from data.processing.text_features import DEFAULT_N_FEATURES
+
+    names = selected_models(model_name)
+    check_text_options(names, text_features, text_components)
+    projects_df = read_dataset("projects")
+
+    if projects_df is None:
+        raise FileNotFoundError(
+            "Projects dataset not found. Run the `etl` subcommand first.")
+
+    if text_features:
+        X, y = text_classifier_features(projects_df, text_n_features or DEFAULT_N_FEATURES,
+                                        workers=None)
+    else:
+        X, y = classifier_features(projects_df)
+
+    result = []
+
+    for name in names:
+        print(f"Training {name}...")
+        model = load_model(name, text_components if text_features else None, text_n_features)
+        model.X, model.y = X, y
+        model.train()
+        result.append((name, model))
+
+    return result
+
+
+def etl_command(args: argparse.Namespace) -> int:
+    from data.processing.etl import run_etl
+
+    osc_df, projects_df = run_etl(args.osc, args.projects, args.workers,
+                                  validate_sources=not args.skip_validation)
+
+    print(f"OSC dataset: {len(osc_df)} rows")
+    print(f"Projects dataset: {0 if projects_df is None else len(projects_df)} rows")
+
+    return 0
+
+
+def train_command(args: argparse.Namespace) -> int:
+    for name, model in trained_models(args.model, args.text_features, args.text_components):
+        if args.output_dir:
+            os.makedirs(args.output_dir, exist_ok=True)
+            model_path = os.path.join(args.output_dir, f"{name}.joblib")
+            model.save_model(model_path)
+            print(f"Saved {name} to {model_path}")
+
+    return 0
+
+
+def evaluate_command(args: argparse.Namespace) -> int:
+    for name, model in trained_models(args.model, args.text_features, args.text_components):
+        print(f"\nEvaluating {name}...")
+        model.evaluate()
+
+    return 0
+
+
+def run_command(args: argparse.Namespace) -> int:
+    from pipeline import pipeline_stages, run_pipeline
+
+    stages = pipeline_stages(args.osc, args.projects,
+                             models=selected_models(args.model),
+                             validate_sources=not args.skip_validation,
+                             workers=args.workers,
+                             text_features=args.text_features,
+                             text_components=args.text_components)
+    run_pipeline(from_stage=args.from_stage, only=args.only, stages=stages)
+
+    return 0
+
+
+def predict_cbr_command(args: argparse.Namespace) -> int:
+    from data.processing.data_parser import read_dataset
+    from data.processing.features import (CBR_CATEGORICAL_COLS, CBR_NUMERIC_COLS,
+                                          CBR_SET_COLS, CBR_TARGET_COL, CBR_TEXT_COL,
+                                          cbr_dataset)
+    from model.case_base_reasoning_model import CaseBasedReasoning
+    from model.weighted_case_base_reasoning_model import WeightedCaseBasedReasoning
+
+    osc_df = read_dataset("osc")
+    projects_df = read_dataset("projects")
+
+    if osc_df is None or projects_df is None:
+        raise FileNotFoundError(
+            "Processed datasets not found. Run the `etl` subcommand first.")
+
+    use_text = args.texto is not None and not args.weighted
+    cases = cbr_dataset(projects_df, osc_df, include_text=use_text)
+
+    if args.weighted:
+        rbc = WeightedCaseBasedReasoning(data=cases,
+                                         categorical_cols=CBR_CATEGORICAL_COLS,
+                                         numeric_cols=CBR_NUMERIC_COLS,
+                                         target_col=CBR_TARGET_COL,
+                                         weights=dict(args.weight),
+                                         set_cols=CBR_SET_COLS)
+    else:
+        rbc = CaseBasedReasoning(data=cases,
+                                 categorical_cols=CBR_CATEGORICAL_COLS,
+                                 numeric_cols=CBR_NUMERIC_COLS,
+                                 target_col=CBR_TARGET_COL,
+                                 text_cols=[CBR_TEXT_COL] if use_text else None)
+    rbc.preprocess()
+
+    new_case = {
+        "Áreas de Atuação": args.areas,
+        "UF": args.uf,
+        "Município": args.municipio,
+        "Valor Total (R$)": args.valor,
+        CBR_TEXT_COL: args.texto,
+    }
+
+    predicted_value, similar_cases_df = rbc.predict(new_case, k=args.k)
+
+    print(f"Predicted Value Total (R$): {predicted_value:.2f}")
+    print("\nMost similar cases:")
+    print(similar_cases_df.to_string(index=False))
+
+    return 0
+
+
+def feature_weight(value: str) -> tuple[str, float]:
+    column, separator, weight = value.rpartition("=")
+
+    if not separator or not column:
+        raise argparse.ArgumentTypeError(f"Expected ATRIBUTO=PESO, got {value!r}")
+
+    return column, float(weight)
+
+
+def add_text_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--text-features", action="store_true",
+                        help="Adiciona atributos de texto (hashing) do nome e da descrição dos projetos.")
+    parser.add_argument("--text-components", type=int, default=None, metavar="N",
+                        help="Reduz os atributos de texto a N dimensões (SVD), ajustadas com cada modelo. "
+                             "Obrigatório para o naive-bayes.")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="mao-amiga",
+        description="ETL e modelos de classificação de ações beneficentes.")
+    parser.add_argument("--metrics", default=None,
+                        help="Arquivo JSON lines onde as métricas de cada etapa serão registradas.")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Mede o pico de memória de cada etapa (mais lento).")
+    parser.add_argument("--profile", action="append", default=[], metavar="STAGE",
+                        help="Executa a etapa com cProfile, e.g. projects.projects_dataset.")
+    parser.add_argument("--profile-dir", default=".",
+                        help="Diretório dos arquivos .prof gerados por --profile.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    etl = subparsers.add_parser("etl", help="Converte e processa as bases de OSCs e projetos.")
+    etl.add_argument("--osc", default=OSC_DATASET,
+                     help="Base bruta de OSCs, dentro do diretório de datasets.")
+    etl.add_argument("--projects", default=PROJECTS_DATASET,
+                     help="Base bruta de projetos, dentro do diretório de datasets.")
+    etl.add_argument("--workers", type=int, default=None,
+                     help="Número de processos. Por padrão, usa todos os núcleos.")
+    etl.add_argument("--skip-validation", action="store_true",
+                     help="Não separa em quarentena as linhas que falham na validação.")
+    etl.set_defaults(handler=etl_command)
+
+    model_choices = [*MODELS, "all"]
+
+    train = subparsers.add_parser("train", help="Treina os modelos de classificação.")
+    train.add_argument("--model", choices=model_choices, default="all")
+    train.add_argument("--output-dir", default=None,
+                       help="Diretório onde os modelos treinados serão salvos.")
+    add_text_arguments(train)
+    train.set_defaults(handler=train_command)
+
+    evaluate = subparsers.add_parser("evaluate", help="Treina e avalia os modelos de classificação.")
+    evaluate.add_argument("--model", choices=model_choices, default="all")
+    add_text_arguments(evaluate)
+    evaluate.set_defaults(handler=evaluate_command)
+
+    run = subparsers.add_parser("run",
+                                help="Executa o pipeline completo com checkpoints, retomando da última etapa pendente.")
+    run.add_argument("--osc", default=OSC_DATASET)
+    run.add_argument("--projects", default=PROJECTS_DATASET)
+    run.add_argument("--model", choices=model_choices, default="all")
+    run.add_argument("--workers", type=int, default=None)
+    run.add_argument("--skip-validation", action="store_true")
+    add_text_arguments(run)
+    run_stage = run.add_mutually_exclusive_group()
+    run_stage.add_argument("--from", dest="from_stage", default=None, metavar="STAGE",
+                           help="Reexecuta a partir desta etapa, e.g. projects_dataset.")
+    run_stage.add_argument("--only", default=None, metavar="STAGE",
+                           help="Executa somente esta etapa, e.g. train[svm].")
+    run.set_defaults(handler=run_command)
+
+    predict_cbr = subparsers.add_parser("predict-cbr",
+                                        help="Estima o valor total de um novo caso via RBC.")
+    predict_cbr.add_argument("--areas", required=True, help="Áreas de Atuação da OSC.")
+    predict_cbr.add_argument("--uf", required=True)
+    predict_cbr.add_argument("--municipio", required=True)
+    predict_cbr.add_argument("--valor", type=float, default=0.0)
+    predict_cbr.add_argument("--texto", default=None,
+                             help="Nome e descrição do projeto, comparados por termos em comum (RBC não ponderado).")
+    predict_cbr.add_argument("-k", type=int, default=3, help="Número de casos similares.")
+    predict_cbr.add_argument("--weighted", action="store_true",
+                             help="Usa o RBC com pesos por atributo e similaridade de conjuntos para as áreas.")
+    predict_cbr.add_argument("--weight", action="append", default=[], type=feature_weight,
+                             metavar="ATRIBUTO=PESO",
+                             help="Peso de um atributo no RBC ponderado, e.g. Município=0.5.")
+    predict_cbr.set_defaults(handler=predict_cbr_command)
+
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    if args.metrics or args.profile:
+        from data.instrumentation import (JsonLinesSink, MemorySink,
+                                          profile_stages, set_sink)
+
+        sink = JsonLinesSink(args.metrics) if args.metrics else MemorySink()
+        set_sink(sink, trace_memory=args.trace_memory)
+        profile_stages(args.profile, args.profile_dir)
+
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,2 +1,6 @@
-DATASET_DIR = "../datasets/"
+import os
+
+DATASET_DIR = os.environ.get("MAO_AMIGA_DATASET_DIR", "../datasets/")
 MAIN_DATASET = "base_2025_2.csv"
+OSC_DATASET = "osc_2025_2.csv"
+PROJECTS_DATASET = "projetos.csv"
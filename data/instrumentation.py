@@ -0,0 +1,305 @@
+"""
+Stage-level instrumentation for the ETL and the machine learning models.
+
+Instrumented stages record wall time, CPU time, rows in and out and, optionally,
+peak memory. Records are only collected once a sink is installed with `set_sink`;
+until then, instrumented functions run with a single extra check.
+
+The sink lives in the parent process. Stages running in pool workers are recorded
+through `run_recorded`, which sends their records back to be emitted by the parent,
+and the CPU time of a stage includes the time of the worker processes it waited for.
+
+Example:
+    from data.instrumentation import JsonLinesSink, set_sink, profile_stages
+
+    set_sink(JsonLinesSink("metrics.jsonl"), trace_memory=True)
+    profile_stages(["projects.projects_dataset"], output_dir="profiles")
+"""
+import cProfile
+import functools
+import json
+import os
+import time
+import tracemalloc
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+
+class InstrumentationSink(ABC):
+    """
+    Destination of the stage records.
+    """
+    @abstractmethod
+    def emit(self, record: dict) -> None:
+        pass
+
+
+class MemorySink(InstrumentationSink):
+    """
+    Keeps the stage records in memory, in the order they finished.
+    """
+
+    def __init__(self):
+        self.records: list[dict] = []
+
+    def emit(self, record: dict) -> None:
+        self.records.append(record)
+
+    def by_stage(self, stage: str) -> list[dict]:
+        return [record for record in self.records if record["stage"] == stage]
+
+
+class JsonLinesSink(InstrumentationSink):
+    """
+    Appends each stage record as a JSON line to a file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def emit(self, record: dict) -> None:
+        with open(self.path, "a", encoding="utf-8") as output:
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+_sink: Optional[InstrumentationSink] = None
+_trace_memory = False
+_profiled_stages: set[str] = set(
+    stage for stage in os.environ.get("MAO_AMIGA_PROFILE", "").split(",") if stage)
+_profile_dir = os.environ.get("MAO_AMIGA_PROFILE_DIR", ".")
+_profiling = False
+_memory_frames: list[dict] = []
+
+
+def set_sink(sink: Optional[InstrumentationSink],
+             trace_memory: bool = False) -> None:
+    """
+    Installs the sink that receives the stage records. None disables the instrumentation.
+
+    Args:
+        sink (Optional[InstrumentationSink]): The sink to be used.
+        trace_memory (bool): Whether to measure the peak memory of each stage with `tracemalloc`.
+            Tracing allocations slows the stages down, so it is disabled by default.
+    """
+    global _sink, _trace_memory
+
+    _sink = sink
+    _trace_memory = trace_memory
+
+
+def get_sink() -> Optional[InstrumentationSink]:
+    return _sink
+
+
+def is_tracing_memory() -> bool:
+    return _trace_memory
+
+
+def run_recorded(func: Callable, trace_memory: bool, *args) -> tuple[Any, list[dict]]:
+    """
+    Runs a function in a worker process, collecting the records of its stages in memory.
+    The parent process emits them to its own sink with `emit_records`.
+
+    Args:
+        func (Callable): A module-level (picklable) function.
+        trace_memory (bool): Whether to measure the peak memory of each stage.
+        *args: The arguments of `func`.
+
+    Returns:
+        tuple[Any, list[dict]]: The result of `func` and the records of its stages.
+    """
+    previous = (_sink, _trace_memory)
+    sink = MemorySink()
+    set_sink(sink, trace_memory)
+
+    try:
+        return func(*args), sink.records
+    finally:
+        set_sink(*previous)
+
+
+def emit_records(records: Iterable[dict]) -> None:
+    if _sink is not None:
+        for record in records:
+            _sink.emit(record)
+
+
+def profile_stages(stages: Iterable[str], output_dir: str = ".") -> None:
+    """
+    Enables cProfile for the given stages. Each run of a profiled stage writes a
+    `.prof` file (readable with `pstats` or snakeviz) into `output_dir`.
+    The same can be done with the `MAO_AMIGA_PROFILE` (comma-separated stages)
+    and `MAO_AMIGA_PROFILE_DIR` environment variables.
+
+    Args:
+        stages (Iterable[str]): The stage names, such as "projects.projects_dataset".
+        output_dir (str): The directory of the profile files.
+    """
+    global _profile_dir
+
+    _profiled_stages.clear()
+    _profiled_stages.update(stages)
+    _profile_dir = output_dir
+
+
+def row_count(value: Any) -> Optional[int]:
+    """
+    Counts the rows of a dataset-like value (DataFrame, Series, arrays, sparse matrices).
+    Tuples are counted by their first element, as in `(X, y)` results.
+
+    Args:
+        value (Any): The value to be counted.
+
+    Returns:
+        Optional[int]: The number of rows, or None if the value is not dataset-like.
+    """
+    if isinstance(value, tuple) and value:
+        return row_count(value[0])
+
+    shape = getattr(value, "shape", None)
+
+    if shape:
+        return int(shape[0])
+
+    return None
+
+
+def _rows_in(args: tuple, kwargs: dict) -> Optional[int]:
+    for value in (*args, *kwargs.values()):
+        rows = row_count(value)
+
+        if rows is not None:
+            return rows
+
+    # methods: count the data held by the instance
+    if args:
+        for attribute in ("X", "data"):
+            rows = row_count(getattr(args[0], attribute, None))
+
+            if rows is not None:
+                return rows
+
+    return None
+
+
+def _cpu_time() -> float:
+    # children times only grow once the workers are joined, e.g. when a pool shuts down
+    times = os.times()
+
+    return time.process_time() + times.children_user + times.children_system
+
+
+def _start_memory_frame() -> dict:
+    frame = {"started_tracing": False, "outer_peak": 0, "floor": 0}
+
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+        frame["started_tracing"] = True
+    else:
+        frame["outer_peak"] = tracemalloc.get_traced_memory()[1]
+
+    frame["baseline"] = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    _memory_frames.append(frame)
+
+    return frame
+
+
+def _stop_memory_frame(frame: dict) -> float:
+    _memory_frames.pop()
+    peak = max(tracemalloc.get_traced_memory()[1], frame["floor"])
+
+    if frame["started_tracing"]:
+        tracemalloc.stop()
+    elif _memory_frames:
+        # the enclosing stage must still see this stage's peak
+        parent = _memory_frames[-1]
+        parent["floor"] = max(parent["floor"], frame["outer_peak"], peak)
+
+    return max(peak - frame["baseline"], 0) / 1024 ** 2
+
+
+@contextmanager
+def stage(name: str, rows_in: Optional[int] = None) -> Iterator[dict]:
+    """
+    Instruments a block of code as a stage. The yielded record may be updated
+    inside the block, e.g. with `record["rows_out"] = len(result)`.
+
+    Args:
+        name (str): The stage name.
+        rows_in (Optional[int]): The number of input rows.
+
+    Yields:
+        dict: The stage record, emitted to the sink when the block ends.
+    """
+    global _profiling
+
+    record = {"stage": name, "pid": os.getpid(), "rows_in": rows_in, "rows_out": None}
+
+    if _sink is None:
+        yield record
+        return
+
+    memory_frame = _start_memory_frame() if _trace_memory else None
+    profiler = None
+
+    if name in _profiled_stages and not _profiling:
+        profiler = cProfile.Profile()
+        _profiling = True
+        profiler.enable()
+
+    record["started_at"] = time.time()
+    wall_start = time.perf_counter()
+    cpu_start = _cpu_time()
+
+    try:
+        yield record
+    except BaseException as error:
+        record["error"] = type(error).__name__
+        raise
+    finally:
+        record["wall_seconds"] = time.perf_counter() - wall_start
+        record["cpu_seconds"] = _cpu_time() - cpu_start
+
+        if profiler is not None:
+            profiler.disable()
+            _profiling = False
+            os.makedirs(_profile_dir, exist_ok=True)
+            profile_path = os.path.join(
+                _profile_dir, f"{name}-{os.getpid()}-{int(record['started_at'])}.prof")
+            profiler.dump_stats(profile_path)
+            record["profile"] = profile_path
+
+        record["peak_memory_mb"] = (_stop_memory_frame(memory_frame)
+                                    if memory_frame is not None else None)
+
+        _sink.emit(record)
+
+
+def instrumented(name: Optional[str] = None) -> Callable[[Callable], Callable]:
+    """
+    Decorates a function or method as an instrumented stage. Rows in are taken from
+    the first dataset-like argument (or the instance's `X`/`data`), rows out from the result.
+
+    Args:
+        name (Optional[str]): The stage name. Defaults to "<module>.<qualified name>",
+            such as "osc.osc_dataset" or "svm_model.SVMModel.train".
+    """
+    def decorator(func: Callable) -> Callable:
+        stage_name = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _sink is None:
+                return func(*args, **kwargs)
+
+            with stage(stage_name, _rows_in(args, kwargs)) as record:
+                result = func(*args, **kwargs)
+                record["rows_out"] = row_count(result)
+
+                return result
+
+        return wrapper
+
+    return decorator
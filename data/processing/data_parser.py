@@ -1,25 +1,35 @@
+import json
 import re
 from typing import Optional, Literal
 import pandas as pd
 import os
 from data.constants.dataset_constants import DATASET_DIR
+from data.instrumentation import instrumented
+from data.processing.ingestion import read_source
 
 
 PortugueseEncoding = Literal["utf-8", "latin1",
                              "cp1252", "iso-8859-15", "mac-roman"]
 
 
+@instrumented()
 def to_utf8(dataset_filename: str,
             separator: Optional[str] = None,
-            input_encoding: PortugueseEncoding = "utf-8") -> Optional[str]:
+            input_encoding: PortugueseEncoding = "utf-8",
+            use_cache: bool = True) -> Optional[str]:
     """
     Converts a dataset to UTF-8 encoding and saves it with a new suffix.
     This method accepts various Portuguese encodings as input.
+    The source format (xlsx, html or csv) is detected by content, and parsed
+    sources are cached, so unchanged files skip the parser on later runs.
+    Malformed CSV lines are skipped; their line numbers are written next to the
+    converted file (see `read_converted`).
 
     Args:
         dataset_name (str): The name of the dataset file to convert.
         separator (Optional[str]): The delimiter used in CSV files.
         input_encoding (PortugueseEncoding): The encoding of the input file. Defaults to "utf-8".
+        use_cache (bool): Whether to use the cached intermediate of the source. Defaults to True.
 
     Returns:
         Optional[str]: The path to the converted dataset file, or None if an error occurred.
@@ -32,20 +42,11 @@ def to_utf8(dataset_filename: str,
         if full_path is None:
             return None
 
-        filename, extension = os.path.splitext(dataset_filename)
-        main_df: pd.DataFrame
-
-        if extension == ".xlsx":
-            main_df = pd.read_excel(full_path,
-                                    engine="openpyxl")
-        elif extension == ".csv":
-            main_df = pd.read_csv(full_path,
-                                  encoding=input_encoding,
-                                  sep=separator if separator else ",",
-                                  on_bad_lines="skip")
-        else:
-            main_df = pd.read_html(full_path,
-                                   encoding=input_encoding)[0]
+        filename, _ = os.path.splitext(dataset_filename)
+        main_df = read_source(full_path,
+                              separator,
+                              input_encoding,
+                              use_cache)
 
         result_path = output_path(filename)
 
@@ -54,6 +55,14 @@ def to_utf8(dataset_filename: str,
                        sep=";",
                        index=False)
 
+        skipped_lines = main_df.attrs.get("skipped_lines", [])
+
+        with open(skipped_lines_path(result_path), "w", encoding=OUTPUT_ENCODING) as output:
+            json.dump({"source": dataset_filename, "skipped_lines": skipped_lines}, output)
+
+        if skipped_lines:
+            print(f"Skipped {len(skipped_lines)} malformed lines of {dataset_filename}.")
+
         return result_path
 
     except Exception as e:
@@ -77,6 +86,36 @@ def output_path(dataset_filename: str) -> str:
     return DATASET_DIR + dataset_filename + OUTPUT_SUFFIX + ".csv"
 
 
+def skipped_lines_path(converted_path: str) -> str:
+    """
+    Generates the path of the file listing the source lines skipped by `to_utf8`.
+    """
+    return os.path.splitext(converted_path)[0] + "-skipped.json"
+
+
+def read_converted(converted_path: str) -> pd.DataFrame:
+    """
+    Reads a dataset converted by `to_utf8`, with all columns as strings.
+    The source lines skipped during the conversion are kept in `attrs["skipped_lines"]`,
+    so the validation stage can report them.
+
+    Args:
+        converted_path (str): The path returned by `to_utf8`.
+
+    Returns:
+        pd.DataFrame: The converted dataset.
+    """
+    dataset = pd.read_csv(converted_path, sep=";", dtype=str)
+
+    try:
+        with open(skipped_lines_path(converted_path), encoding="utf-8") as skipped_file:
+            dataset.attrs["skipped_lines"] = json.load(skipped_file)["skipped_lines"]
+    except (OSError, ValueError, KeyError):
+        dataset.attrs["skipped_lines"] = []
+
+    return dataset
+
+
 def dataset_path(dataset_filename: str) -> Optional[str]:
     """
     Generates the full path for a dataset file.
@@ -144,6 +183,7 @@ def valid_cnpj(raw_cnpj: str | int) -> Optional[str]:
         return None
 
 
+@instrumented()
 def write_dataset(name: str, dataset: pd.DataFrame) -> Optional[str]:
     """
     Writes the processed dataset into a `.csv` file.
@@ -166,6 +206,27 @@ def write_dataset(name: str, dataset: pd.DataFrame) -> Optional[str]:
         return None
 
 
+@instrumented()
+def read_dataset(name: str) -> Optional[pd.DataFrame]:
+    """
+    Reads a processed dataset previously written by `write_dataset`.
+
+    Args:
+        name: the name used when the dataset was written
+
+    Returns:
+        Optional[pd.DataFrame]: the dataset, with all columns as strings, or None if it does not exist
+    """
+    OUTPUT_SUFFIX = "-dataset"
+    full_path = dataset_path(f"{name}{OUTPUT_SUFFIX}.csv")
+
+    if full_path is None:
+        return None
+
+    return pd.read_csv(full_path, sep=";", index_col=0, dtype=str)
+
+
+@instrumented()
 def to_numeric_value(dataset: pd.DataFrame,
                      column: str,
                      as_type: Literal["int", "float"]) -> pd.DataFrame:
@@ -0,0 +1,94 @@
+from typing import Optional
+import pandas as pd
+
+from data.constants.dataset_constants import OSC_DATASET, PROJECTS_DATASET
+from data.processing.data_parser import read_converted, to_utf8, write_dataset
+from data.processing.osc import osc_dataset
+from data.processing.parallel import map_ordered
+from data.processing.projects import projects_dataset
+from data.processing.validation import OSC_RULES, PROJECTS_RULES, quarantine_invalid
+from data.instrumentation import instrumented
+
+
+def convert_source(to_utf8_args: tuple) -> Optional[str]:
+    return to_utf8(*to_utf8_args)
+
+
+@instrumented()
+def transcode_sources(osc_filename: str = OSC_DATASET,
+                      projects_filename: str = PROJECTS_DATASET,
+                      workers: Optional[int] = None) -> tuple[Optional[str], Optional[str]]:
+    """
+    Converts the OSC and projects sources to UTF-8. Both conversions are
+    independent, so they run at the same time when more than one worker is available.
+
+    Args:
+        osc_filename (str): The raw OSC dataset filename, inside the datasets directory.
+        projects_filename (str): The raw projects dataset filename, inside the datasets directory.
+        workers (Optional[int]): The number of worker processes. None uses all available cores.
+
+    Returns:
+        tuple[Optional[str], Optional[str]]: The paths of the converted OSC and projects sources.
+    """
+    # map_ordered records the conversions run in the workers, as the ones run serially
+    osc_source, projects_source = map_ordered(convert_source,
+                                              [(osc_filename, ";", "latin1"),
+                                               (projects_filename,)],
+                                              workers)
+
+    return osc_source, projects_source
+
+
+@instrumented()
+def run_etl(osc_filename: str = OSC_DATASET,
+            projects_filename: str = PROJECTS_DATASET,
+            workers: Optional[int] = None,
+            validate_sources: bool = True) -> tuple[pd.DataFrame, Optional[pd.DataFrame]]:
+    """
+    Runs the full ETL: converts both sources to UTF-8, validates them, processes the
+    OSC and projects datasets and writes them to the datasets directory.
+    Rows failing validation are written to "osc-quarantine.csv" and
+    "projects-quarantine.csv", with the reasons and summary counts.
+    Row transforms are split by chunks across a process pool; results are merged in
+    the original row order, so the output matches a serial run.
+
+    Args:
+        osc_filename (str): The raw OSC dataset filename, inside the datasets directory.
+        projects_filename (str): The raw projects dataset filename, inside the datasets directory.
+        workers (Optional[int]): The number of worker processes. None uses all available cores.
+        validate_sources (bool): Whether to quarantine the rows failing validation. Defaults to True.
+
+    Returns:
+        tuple[pd.DataFrame, Optional[pd.DataFrame]]: The processed OSC and projects datasets.
+    """
+    parsed_osc_source, parsed_projects_source = transcode_sources(osc_filename,
+                                                                  projects_filename,
+                                                                  workers)
+
+    if parsed_osc_source is None:
+        raise FileNotFoundError(
+            f"File {osc_filename} not found or could not be converted to UTF-8.")
+
+    if parsed_projects_source is None:
+        raise FileNotFoundError(
+            f"File {projects_filename} not found or could not be converted to UTF-8.")
+
+    osc_source = read_converted(parsed_osc_source)
+
+    if validate_sources:
+        osc_source = quarantine_invalid("osc", osc_source, OSC_RULES)
+
+    osc_df = osc_dataset(osc_source, workers)
+    write_dataset("osc", osc_df)
+
+    projects_source = read_converted(parsed_projects_source)
+
+    if validate_sources:
+        projects_source = quarantine_invalid("projects", projects_source, PROJECTS_RULES)
+
+    projects_df = projects_dataset(projects_source, osc_df, workers)
+
+    if projects_df is not None:
+        write_dataset("projects", projects_df)
+
+    return osc_df, projects_df
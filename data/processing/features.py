@@ -0,0 +1,110 @@
+from typing import Optional
+import pandas as pd
+from scipy import sparse
+from sklearn.preprocessing import LabelEncoder
+
+from data.processing.data_parser import to_numeric_value
+from data.processing.text_features import DEFAULT_N_FEATURES, project_texts, text_features
+from data.instrumentation import instrumented
+
+
+VALUE_TOTAL_BINS = [-1, 20000, 100000, float("inf")]
+VALUE_TOTAL_LABELS = ["Baixo", "Médio", "Alto"]
+
+CBR_CATEGORICAL_COLS = ["Áreas de Atuação", "UF", "Município"]
+CBR_NUMERIC_COLS = ["Valor Total (R$)"]
+CBR_TARGET_COL = "Valor Total (R$)"
+# compared by set overlap in `WeightedCaseBasedReasoning`
+CBR_SET_COLS = ["Áreas de Atuação"]
+CBR_TEXT_COL = "Texto"
+
+
+@instrumented()
+def classifier_features(projects_dataset: pd.DataFrame) -> tuple[pd.DataFrame, pd.Series]:
+    """
+    Builds the features and labels used by the value tier classifiers.
+    Projects are labeled by their total value ("Baixo", "Médio" or "Alto").
+
+    Args:
+        projects_dataset (pd.DataFrame): The processed projects dataset.
+
+    Returns:
+        tuple[pd.DataFrame, pd.Series]: The features (X) and the value tier labels (y).
+    """
+    data = to_numeric_value(projects_dataset, "Valor Total (R$)", "float")
+    # amounts are numeric features; the notebook label-encoded them as strings
+    data = to_numeric_value(data, "Valor Captado (R$)", "float")
+    data = to_numeric_value(data, "Total de Beneficiários", "int")
+
+    data["Valor Total Categoria"] = pd.cut(data["Valor Total (R$)"],
+                                           bins=VALUE_TOTAL_BINS,
+                                           labels=VALUE_TOTAL_LABELS)
+
+    for column in data.select_dtypes(include=["object"]).columns:
+        data[column] = LabelEncoder().fit_transform(data[column].astype(str))
+
+    X = data.drop(["Valor Total (R$)",
+                   "Valor Total Categoria",
+                   "Nome",
+                   "ID Projeto",
+                   "CNPJ OSC",
+                   "Descrição",
+                   "Data de Início",
+                   "Data de Término",
+                   "Status"], axis=1, errors="ignore").fillna(0)
+    y = data["Valor Total Categoria"].astype(str).replace("nan", "Baixo")
+
+    return X, y
+
+
+@instrumented()
+def text_classifier_features(projects_dataset: pd.DataFrame,
+                             n_features: int = DEFAULT_N_FEATURES,
+                             workers: Optional[int] = 1) -> tuple[sparse.csr_matrix, pd.Series]:
+    """
+    Builds the classifier features of `classifier_features`, plus hashed text
+    features from the project names and descriptions, as the last `n_features` columns.
+    To reduce the text features, add a `TextReduction` step to the model, so it is
+    fitted on the training split only.
+
+    Args:
+        projects_dataset (pd.DataFrame): The processed projects dataset.
+        n_features (int): The number of hash buckets for the texts.
+        workers (Optional[int]): The number of processes used to hash the texts.
+
+    Returns:
+        tuple[sparse.csr_matrix, pd.Series]: The sparse features (X) and the value tier labels (y).
+    """
+    X, y = classifier_features(projects_dataset)
+    texts = text_features(project_texts(projects_dataset), n_features, workers)
+
+    return sparse.hstack([sparse.csr_matrix(X.to_numpy(dtype=float)), texts], format="csr"), y
+
+
+@instrumented()
+def cbr_dataset(projects_dataset: pd.DataFrame,
+                osc_dataset: pd.DataFrame,
+                include_text: bool = False) -> pd.DataFrame:
+    """
+    Builds the case base used by `CaseBasedReasoning`, crossing each project
+    with the OSC responsible for it.
+
+    Args:
+        projects_dataset (pd.DataFrame): The processed projects dataset.
+        osc_dataset (pd.DataFrame): The processed OSC dataset.
+        include_text (bool): Whether to keep the project name and description, joined in the "Texto" column.
+
+    Returns:
+        pd.DataFrame: The case base, without incomplete cases.
+    """
+    merged = projects_dataset.merge(osc_dataset,
+                                    left_on="CNPJ OSC",
+                                    right_on="CNPJ",
+                                    how="left")
+
+    cases = merged[CBR_CATEGORICAL_COLS + CBR_NUMERIC_COLS].dropna()
+
+    if include_text:
+        cases = cases.assign(**{CBR_TEXT_COL: project_texts(merged.loc[cases.index])})
+
+    return to_numeric_value(cases, CBR_TARGET_COL, "float").reset_index(drop=True)
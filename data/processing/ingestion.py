@@ -0,0 +1,272 @@
+import hashlib
+import os
+import re
+import time
+import warnings
+from typing import Any, Literal, Optional
+import pandas as pd
+from pandas.errors import ParserWarning
+
+from data.constants.dataset_constants import DATASET_DIR
+from data.instrumentation import instrumented
+
+
+SourceFormat = Literal["xlsx", "html", "csv"]
+
+CACHE_DIR = DATASET_DIR + ".cache/"
+# bump whenever the parsing of any format changes, to invalidate old intermediates
+CACHE_VERSION = "2"
+
+ZIP_SIGNATURE = b"PK\x03\x04"
+HTML_MARKERS = (b"<!doctype html", b"<html", b"<table", b"<?xml", b"<meta", b"<head")
+SNIFF_SIZE = 2048
+HASH_BLOCK_SIZE = 1024 * 1024
+# partial cache writes older than this are left over by crashed runs
+STALE_PARTIAL_SECONDS = 60 * 60
+# <path and options key>-v<cache version>-<content hash>.pkl
+CACHE_ENTRY_PATTERN = re.compile(r"[0-9a-f]{16}-v[^-]+-[0-9a-f]{64}\.pkl")
+SKIPPED_LINE_PATTERN = re.compile(r"Skipping line (\d+)")
+
+
+def source_format(full_path: str) -> SourceFormat:
+    """
+    Detects the format of a source file by its content, regardless of its extension.
+    IPEA exports are often HTML tables saved as `.xls`, or spreadsheets saved without extension.
+
+    Args:
+        full_path (str): The path to the source file.
+
+    Returns:
+        SourceFormat: "xlsx" for zip-based spreadsheets, "html" for markup, "csv" otherwise.
+    """
+    with open(full_path, "rb") as source:
+        head = source.read(SNIFF_SIZE)
+
+    if head.startswith(ZIP_SIGNATURE):
+        return "xlsx"
+
+    markup = head.lstrip(b"\xef\xbb\xbf \t\r\n").lower()
+
+    if markup.startswith(b"<") and any(marker in markup for marker in HTML_MARKERS):
+        return "html"
+
+    return "csv"
+
+
+def file_hash(full_path: str) -> str:
+    """
+    Computes the SHA-256 hash of a file, reading it in blocks.
+
+    Args:
+        full_path (str): The path to the file.
+
+    Returns:
+        str: The hexadecimal digest of the file content.
+    """
+    digest = hashlib.sha256()
+
+    with open(full_path, "rb") as source:
+        for block in iter(lambda: source.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+
+def cell_text(value: Any) -> Optional[str]:
+    """
+    Converts a spreadsheet cell to text, as CSV sources are read. Integral numbers
+    lose the ".0" suffix, so codes such as CNPJs keep their digits only.
+    """
+    if value is None:
+        return None
+
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+
+    return str(value)
+
+
+def read_xlsx(full_path: str) -> pd.DataFrame:
+    """
+    Reads the first sheet of a spreadsheet with openpyxl's read-only (streaming) mode,
+    which does not load the whole workbook structure into memory.
+
+    Args:
+        full_path (str): The path to the spreadsheet.
+
+    Returns:
+        pd.DataFrame: The sheet content as text, using the first row as header.
+    """
+    from openpyxl import load_workbook
+
+    # a file handle skips openpyxl's extension check, so files without `.xlsx` are read too
+    with open(full_path, "rb") as source:
+        workbook = load_workbook(source, read_only=True, data_only=True)
+
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = next(rows, None)
+
+            if header is None:
+                return pd.DataFrame()
+
+            return pd.DataFrame.from_records(rows, columns=list(header)).map(cell_text)
+        finally:
+            workbook.close()
+
+
+def parse_source(full_path: str,
+                 source_type: SourceFormat,
+                 separator: Optional[str],
+                 input_encoding: str) -> pd.DataFrame:
+    """
+    Parses a source file with the reader matching its format.
+
+    Args:
+        full_path (str): The path to the source file.
+        source_type (SourceFormat): The format detected by `source_format`.
+        separator (Optional[str]): The delimiter used in CSV files. Defaults to ",".
+        input_encoding (str): The encoding of CSV and HTML files.
+
+    Returns:
+        pd.DataFrame: The parsed source.
+    """
+    if source_type == "xlsx":
+        return read_xlsx(full_path)
+
+    if source_type == "html":
+        return pd.read_html(full_path, encoding=input_encoding)[0]
+
+    return read_csv_source(full_path, separator, input_encoding)
+
+
+def read_csv_source(full_path: str,
+                    separator: Optional[str],
+                    input_encoding: str) -> pd.DataFrame:
+    """
+    Reads a CSV source as text, so values are written back exactly as in the source
+    (a column with an empty CNPJ is not turned into floats). Malformed lines are
+    skipped, and their line numbers are kept in `attrs["skipped_lines"]`.
+
+    Args:
+        full_path (str): The path to the source file.
+        separator (Optional[str]): The delimiter used in the file. Defaults to ",".
+        input_encoding (str): The encoding of the file.
+
+    Returns:
+        pd.DataFrame: The parsed source.
+    """
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always", ParserWarning)
+        source = pd.read_csv(full_path,
+                             encoding=input_encoding,
+                             sep=separator if separator else ",",
+                             dtype=str,
+                             on_bad_lines="warn")
+
+    skipped_lines = []
+
+    for warning in caught:
+        matches = SKIPPED_LINE_PATTERN.findall(str(warning.message))
+
+        if issubclass(warning.category, ParserWarning) and matches:
+            skipped_lines.extend(int(line) for line in matches)
+        else:
+            warnings.warn_explicit(warning.message, warning.category,
+                                   warning.filename, warning.lineno)
+
+    source.attrs["skipped_lines"] = skipped_lines
+
+    return source
+
+
+def cache_prefix(full_path: str,
+                 source_type: SourceFormat,
+                 separator: Optional[str],
+                 input_encoding: str) -> str:
+    """
+    Generates the prefix shared by every cached intermediate of a source path read
+    with the same options, whatever its content or the cache version.
+    """
+    source_key = f"{os.path.abspath(full_path)}:{source_type}:{separator}:{input_encoding}"
+
+    return f"{CACHE_DIR}{hashlib.sha256(source_key.encode('utf-8')).hexdigest()[:16]}-"
+
+
+def cache_path(full_path: str,
+               source_type: SourceFormat,
+               separator: Optional[str],
+               input_encoding: str) -> str:
+    """
+    Generates the path of the cached intermediate of a source. The key covers the file
+    content, the cache version and every parsing option, so a changed file or option
+    never hits a stale entry.
+    """
+    prefix = cache_prefix(full_path, source_type, separator, input_encoding)
+
+    return f"{prefix}v{CACHE_VERSION}-{file_hash(full_path)}.pkl"
+
+
+def prune_cache(cached_path: str, prefix: str) -> None:
+    """
+    Removes the intermediates of the same source and options other than `cached_path`
+    (older contents or cache versions), entries named by older cache layouts and
+    partial writes left by crashed runs.
+    Partial writes are only removed once they are old enough not to belong to a running write.
+    """
+    stale_before = time.time() - STALE_PARTIAL_SECONDS
+
+    for entry in os.scandir(CACHE_DIR):
+        path = os.path.join(CACHE_DIR, entry.name)
+
+        try:
+            if entry.name.endswith(".tmp"):
+                if entry.stat().st_mtime < stale_before:
+                    os.remove(path)
+            elif path != cached_path and (path.startswith(prefix)
+                                          or not CACHE_ENTRY_PATTERN.fullmatch(entry.name)):
+                os.remove(path)
+        except OSError:
+            # another run may have removed or replaced it already
+            pass
+
+
+@instrumented()
+def read_source(full_path: str,
+                separator: Optional[str] = None,
+                input_encoding: str = "utf-8",
+                use_cache: bool = True) -> pd.DataFrame:
+    """
+    Reads a source file of any supported format. Each source is parsed only once:
+    the result is stored as a binary (pickle) intermediate keyed by the file hash,
+    and later reads load the intermediate instead of running the parser again.
+    Only the latest intermediate of each source path and options is kept.
+
+    Args:
+        full_path (str): The path to the source file.
+        separator (Optional[str]): The delimiter used in CSV files.
+        input_encoding (str): The encoding of CSV and HTML files.
+        use_cache (bool): Whether to read and write the cached intermediate.
+
+    Returns:
+        pd.DataFrame: The parsed source.
+    """
+    source_type = source_format(full_path)
+
+    if not use_cache:
+        return parse_source(full_path, source_type, separator, input_encoding)
+
+    cached_path = cache_path(full_path, source_type, separator, input_encoding)
+
+    if os.path.exists(cached_path):
+        return pd.read_pickle(cached_path)
+
+    source = parse_source(full_path, source_type, separator, input_encoding)
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    partial_path = f"{cached_path}.{os.getpid()}.tmp"
+    source.to_pickle(partial_path)
+    os.replace(partial_path, cached_path)
+    prune_cache(cached_path, cache_prefix(full_path, source_type, separator, input_encoding))
+
+    return source
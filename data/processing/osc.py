@@ -1,20 +1,48 @@
+from typing import Optional
 import pandas as pd
-from traitlets import Enum
+from enum import Enum
 from data.constants.raw_data_constants import OngsDatasetCols
 from data.constants.segmentation_code import SegmentationCode
 from data.processing.data_parser import valid_cnpj
+from data.processing.parallel import map_chunks
+from data.instrumentation import instrumented
 
 
-def osc_dataset(dataset: pd.DataFrame) -> pd.DataFrame:
+@instrumented()
+def osc_dataset(dataset: pd.DataFrame,
+                workers: Optional[int] = 1) -> pd.DataFrame:
     """
     Generates a processed OSC dataset with selected and renamed columns.
 
     Args:
         osc_dataset (pd.DataFrame): The original OSC dataset.
+        workers (Optional[int]): The number of processes used for the row transforms.
+            Defaults to 1 (serial). None uses all available cores.
 
     Returns:
         pd.DataFrame: The processed OSC dataset with selected and renamed columns.
     """
+    parsed_rows = map_chunks(osc_rows, dataset, workers)
+
+    return (
+        parsed_rows
+        .reset_index(drop=True)
+        .drop_duplicates(["CNPJ"])
+    )
+
+
+@instrumented()
+def osc_rows(dataset: pd.DataFrame) -> pd.DataFrame:
+    """
+    Applies the row-wise transforms of the OSC dataset (CNPJ formatting and segmentation codes).
+    Each row is handled independently, so the dataset may be processed in chunks.
+
+    Args:
+        dataset (pd.DataFrame): A chunk of the original OSC dataset.
+
+    Returns:
+        pd.DataFrame: The transformed rows, with selected and renamed columns.
+    """
 
     main_columns = dataset.copy()
 
@@ -28,12 +56,8 @@ def osc_dataset(dataset: pd.DataFrame) -> pd.DataFrame:
     renamed = main_columns_osc(main_columns)
     area_codes = [osc_segmentation_codes(row) for _, row in dataset.iterrows()]
     area_codes_df = pd.DataFrame(area_codes, columns=["Áreas de Atuação"])
-    result = (
-        pd.concat([renamed.reset_index(drop=True), area_codes_df], axis=1)
-        .drop_duplicates(["CNPJ"])
-    )
 
-    return result
+    return pd.concat([renamed.reset_index(drop=True), area_codes_df], axis=1)
 
 
 def osc_segmentation_codes(entry: pd.Series) -> str:
@@ -86,6 +110,7 @@ def osc_segmentation_codes(entry: pd.Series) -> str:
     return ", ".join(code_names)
 
 
+@instrumented()
 def main_columns_osc(dataset: pd.DataFrame) -> pd.DataFrame:
     """
     Generates a processed OSC dataset with selected and renamed columns.
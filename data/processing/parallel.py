@@ -0,0 +1,105 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+import pandas as pd
+
+from data.instrumentation import (emit_records, get_sink, instrumented, is_tracing_memory,
+                                  run_recorded)
+
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+
+def worker_count(workers: Optional[int] = None) -> int:
+    """
+    Resolves the number of worker processes to be used.
+
+    Args:
+        workers (Optional[int]): The requested number of workers. When None, all available cores are used.
+
+    Returns:
+        int: A positive number of worker processes.
+    """
+    if workers is None:
+        return os.cpu_count() or 1
+
+    return max(1, workers)
+
+
+def split_chunks(dataset: pd.DataFrame,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> list[pd.DataFrame]:
+    """
+    Splits a dataset into contiguous chunks, preserving the original row order.
+
+    Args:
+        dataset (pd.DataFrame): The dataset to be split.
+        chunk_size (int): The maximum number of rows per chunk.
+
+    Returns:
+        list[pd.DataFrame]: The chunks, in the same order as the original rows.
+    """
+    return [dataset.iloc[start:start + chunk_size]
+            for start in range(0, len(dataset), chunk_size)]
+
+
+@instrumented()
+def map_chunks(transform: Callable[[pd.DataFrame], pd.DataFrame],
+               dataset: pd.DataFrame,
+               workers: Optional[int] = 1,
+               chunk_size: int = DEFAULT_CHUNK_SIZE) -> pd.DataFrame:
+    """
+    Applies a row-wise transform to a dataset, split by chunks across a process pool.
+    Results are concatenated in the original chunk order, so the output is the same
+    as calling `transform` on the whole dataset.
+
+    Args:
+        transform (Callable[[pd.DataFrame], pd.DataFrame]): A module-level (picklable) function that
+            transforms each row of a chunk independently.
+        dataset (pd.DataFrame): The dataset to be transformed.
+        workers (Optional[int]): The number of worker processes. Defaults to 1 (serial). None uses all cores.
+        chunk_size (int): The maximum number of rows per chunk.
+
+    Returns:
+        pd.DataFrame: The transformed dataset.
+    """
+    pool_size = worker_count(workers)
+    chunks = split_chunks(dataset, chunk_size)
+
+    if pool_size == 1 or len(chunks) <= 1:
+        return transform(dataset)
+
+    return pd.concat(map_ordered(transform, chunks, pool_size), axis=0)
+
+
+def map_ordered(transform: Callable[[Any], Any],
+                chunks: list,
+                workers: Optional[int] = 1) -> list:
+    """
+    Applies a transform to each chunk across a process pool, keeping the chunk order.
+    When running serially, chunks are transformed one at a time. The stages recorded
+    inside the workers are emitted to the sink of this process.
+
+    Args:
+        transform (Callable[[Any], Any]): A module-level (picklable) function.
+        chunks (list): The chunks to be transformed.
+        workers (Optional[int]): The number of worker processes. Defaults to 1 (serial). None uses all cores.
+
+    Returns:
+        list: The transformed chunks, in the original order.
+    """
+    pool_size = worker_count(workers)
+
+    if pool_size == 1 or len(chunks) <= 1:
+        return [transform(chunk) for chunk in chunks]
+
+    with ProcessPoolExecutor(max_workers=min(pool_size, len(chunks))) as pool:
+        if get_sink() is None:
+            return list(pool.map(transform, chunks))
+
+        outputs = list(pool.map(partial(run_recorded, transform, is_tracing_memory()), chunks))
+
+    for _, records in outputs:
+        emit_records(records)
+
+    return [result for result, _ in outputs]
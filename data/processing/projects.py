@@ -3,20 +3,65 @@ import pandas as pd
 
 from data.constants.raw_data_constants import ProjectsDatasetCols
 from data.processing.data_parser import brazilian_date, to_numeric_value, valid_cnpj
+from data.processing.parallel import map_chunks
+from data.instrumentation import instrumented
 
 
+@instrumented()
 def projects_dataset(source: pd.DataFrame,
-                     osc_dataset: pd.DataFrame) -> Optional[pd.DataFrame]:
+                     osc_dataset: pd.DataFrame,
+                     workers: Optional[int] = 1) -> Optional[pd.DataFrame]:
     """
     Processes a raw dataset of projects, selecting and renaming specific columns. Results are filtered by region.
 
     Args:
         source (pd.DataFrame): The original dataset containing project information.
         osc_dataset (pd.DataFrame): The processed OSC dataset to filter projects by region.
+        workers (Optional[int]): The number of processes used for the row transforms.
+            Defaults to 1 (serial). None uses all available cores.
 
     Returns:
         pd.DataFrame: The processed dataset, filtered by the "DF" region.
     """
+    parsed_rows = map_chunks(projects_rows, source, workers)
+
+    non_null = (
+        parsed_rows
+        .reset_index(drop=True)
+        .drop_duplicates(["ID Projeto"])
+        .dropna(how="any", subset=["Data de Início"])
+        .dropna(how="all", subset=["Total de Beneficiários",
+                                   "Valor Captado (R$)",
+                                   "Valor Total (R$)"])
+    )
+
+    with_num_benefit_total = (
+        to_numeric_value(non_null, "Total de Beneficiários", "int")
+    )
+    with_num_collected_amount = (
+        to_numeric_value(with_num_benefit_total, "Valor Captado (R$)", "float")
+    )
+    with_num_total_amount = (
+        to_numeric_value(with_num_collected_amount,
+                         "Valor Total (R$)",
+                         "float")
+    )
+
+    return by_region("DF", with_num_total_amount, osc_dataset)
+
+
+@instrumented()
+def projects_rows(source: pd.DataFrame) -> pd.DataFrame:
+    """
+    Applies the row-wise transforms of the projects dataset (status, dates and CNPJ formatting).
+    Each row is handled independently, so the dataset may be processed in chunks.
+
+    Args:
+        source (pd.DataFrame): A chunk of the original dataset containing project information.
+
+    Returns:
+        pd.DataFrame: The transformed rows, with selected and renamed columns.
+    """
 
     parsed_statuses = [
         project_status(row[ProjectsDatasetCols.DT_DATA_INICIO_PROJETO],
@@ -45,28 +90,7 @@ def projects_dataset(source: pd.DataFrame,
 
     renamed = main_columns_projects(main_columns)
 
-    non_null = (
-        pd.concat([renamed.reset_index(drop=True), status_df], axis=1)
-        .drop_duplicates(["ID Projeto"])
-        .dropna(how="any", subset=["Data de Início"])
-        .dropna(how="all", subset=["Total de Beneficiários",
-                                   "Valor Captado (R$)",
-                                   "Valor Total (R$)"])
-    )
-
-    with_num_benefit_total = (
-        to_numeric_value(non_null, "Total de Beneficiários", "int")
-    )
-    with_num_collected_amount = (
-        to_numeric_value(with_num_benefit_total, "Valor Captado (R$)", "float")
-    )
-    with_num_total_amount = (
-        to_numeric_value(with_num_collected_amount,
-                         "Valor Total (R$)",
-                         "float")
-    )
-
-    return by_region("DF", with_num_total_amount, osc_dataset)
+    return pd.concat([renamed.reset_index(drop=True), status_df], axis=1)
 
 
 def project_status(start_date: Optional[str],
@@ -114,6 +138,7 @@ def project_status(start_date: Optional[str],
     return "Não Informado"
 
 
+@instrumented()
 def by_region(region: str,
               projects_dataset: pd.DataFrame,
               osc_dataset: pd.DataFrame) -> Optional[pd.DataFrame]:
@@ -142,6 +167,7 @@ def by_region(region: str,
     return filtered_projects
 
 
+@instrumented()
 def main_columns_projects(projects_dataset: pd.DataFrame) -> pd.DataFrame:
     """
     Selects and renames the main columns of the 'Projects' dataset.
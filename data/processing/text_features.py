@@ -0,0 +1,144 @@
+from functools import partial
+from typing import Optional
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.decomposition import TruncatedSVD
+from sklearn.feature_extraction.text import HashingVectorizer
+
+from data.instrumentation import instrumented
+from data.processing.parallel import map_ordered, split_chunks
+
+
+TEXT_COLUMNS = ["Nome", "Descrição"]
+# 2^16 buckets keep collisions low for short descriptions, with a fixed footprint
+DEFAULT_N_FEATURES = 2 ** 16
+TEXT_CHUNK_SIZE = 20_000
+
+
+def text_vectorizer(n_features: int = DEFAULT_N_FEATURES) -> HashingVectorizer:
+    """
+    Builds the hashing vectorizer used for project texts: unigrams and bigrams,
+    lowercase and without Portuguese accents ("Educação" -> "educacao").
+    It stores no vocabulary, so it needs no fitting and has a fixed memory footprint.
+
+    Args:
+        n_features (int): The number of hash buckets (columns).
+
+    Returns:
+        HashingVectorizer: The vectorizer, producing L2-normalized rows.
+    """
+    return HashingVectorizer(n_features=n_features,
+                             strip_accents="unicode",
+                             lowercase=True,
+                             ngram_range=(1, 2),
+                             alternate_sign=False,
+                             norm="l2",
+                             dtype=np.float32)
+
+
+def hash_texts(texts: pd.Series, n_features: int = DEFAULT_N_FEATURES) -> sparse.csr_matrix:
+    """
+    Hashes a chunk of texts into a sparse matrix. The vectorizer is stateless,
+    so chunks can be hashed independently, in any process.
+
+    Args:
+        texts (pd.Series): A chunk of raw texts.
+        n_features (int): The number of hash buckets (columns).
+
+    Returns:
+        sparse.csr_matrix: A (texts x n_features) matrix.
+    """
+    return text_vectorizer(n_features).transform(texts.fillna("").astype(str))
+
+
+@instrumented()
+def text_features(texts: pd.Series,
+                  n_features: int = DEFAULT_N_FEATURES,
+                  workers: Optional[int] = 1,
+                  chunk_size: int = TEXT_CHUNK_SIZE) -> sparse.csr_matrix:
+    """
+    Hashes texts into a sparse matrix, processing them in chunks across a process pool.
+    No vocabulary is stored, so the memory footprint depends only on `n_features`
+    and on the number of terms per text.
+
+    Args:
+        texts (pd.Series): The raw texts.
+        n_features (int): The number of hash buckets (columns).
+        workers (Optional[int]): The number of worker processes. Defaults to 1 (serial). None uses all cores.
+        chunk_size (int): The maximum number of texts per chunk.
+
+    Returns:
+        sparse.csr_matrix: A (texts x n_features) matrix, in the original text order.
+    """
+    if len(texts) == 0:
+        return sparse.csr_matrix((0, n_features), dtype=np.float32)
+
+    chunks = split_chunks(texts, chunk_size)
+    matrices = map_ordered(partial(hash_texts, n_features=n_features), chunks, workers)
+
+    return sparse.vstack(matrices, format="csr")
+
+
+class TextReduction(BaseEstimator, TransformerMixin):
+    """
+    Reduces the hashed text block of a feature matrix (its last `n_text_features` columns)
+    to `n_components` dimensions with truncated SVD (LSA), keeping the other columns as they are.
+
+    Used as the first step of a model pipeline, so the SVD is fitted on the training
+    split only and saved with the model, to transform the texts of new projects.
+    `n_text_features` must match the `n_features` used to build the matrix
+    (`text_classifier_features`); a matrix without other columns is rejected.
+
+    Args:
+        n_components (int): The number of text dimensions to keep.
+        n_text_features (int): The number of hashed text columns, at the end of the matrix.
+        random_state (int): The random seed of the SVD solver.
+    """
+
+    def __init__(self,
+                 n_components: int,
+                 n_text_features: int = DEFAULT_N_FEATURES,
+                 random_state: int = 42):
+        self.n_components = n_components
+        self.n_text_features = n_text_features
+        self.random_state = random_state
+
+    def fit(self, X, y=None):
+        n_columns = X.shape[1]
+
+        if not 0 < self.n_text_features < n_columns:
+            raise ValueError(
+                f"The text block ({self.n_text_features} columns) must be narrower than the "
+                f"feature matrix ({n_columns} columns). Use the n_features of the text features.")
+
+        self.n_features_in_ = n_columns
+        self.svd_ = TruncatedSVD(n_components=self.n_components, random_state=self.random_state)
+        self.svd_.fit(sparse.csr_matrix(X)[:, -self.n_text_features:])
+
+        return self
+
+    def transform(self, X) -> np.ndarray:
+        if X.shape[1] != self.n_features_in_:
+            raise ValueError(
+                f"Expected {self.n_features_in_} columns, as in fit, got {X.shape[1]}.")
+
+        matrix = sparse.csr_matrix(X)
+        other_columns = matrix[:, :-self.n_text_features].toarray()
+
+        return np.hstack([other_columns,
+                          self.svd_.transform(matrix[:, -self.n_text_features:])])
+
+
+def project_texts(projects_dataset: pd.DataFrame) -> pd.Series:
+    """
+    Joins the text columns of the projects dataset ("Nome" and "Descrição") into a single text per project.
+    """
+    columns = [column for column in TEXT_COLUMNS if column in projects_dataset.columns]
+    texts = pd.Series("", index=projects_dataset.index)
+
+    for column in columns:
+        texts = texts + " " + projects_dataset[column].fillna("").astype(str)
+
+    return texts.str.strip()
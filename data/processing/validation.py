@@ -0,0 +1,265 @@
+import json
+import time
+from typing import Callable, NamedTuple, Optional
+import numpy as np
+import pandas as pd
+
+from data.constants.dataset_constants import DATASET_DIR
+from data.constants.raw_data_constants import OngsDatasetCols, ProjectsDatasetCols
+from data.instrumentation import instrumented
+
+
+REASONS_COLUMN = "Motivos"
+MIN_DATE = pd.Timestamp("1900-01-01")
+MAX_PROJECT_DATE = pd.Timestamp("2100-12-31")
+
+
+class ValidationRule(NamedTuple):
+    """
+    A declarative data-quality rule. `failures` receives the whole dataset and
+    returns a boolean mask of the rows that break the rule.
+    """
+    name: str
+    reason: str
+    failures: Callable[[pd.DataFrame], pd.Series]
+
+
+def is_missing(values: pd.Series) -> pd.Series:
+    """
+    Flags empty values, as read from the sources (NaN, blank or "nan").
+    """
+    return values.isna() | values.isin(["", " ", "nan", "NaN"])
+
+
+def invalid_cnpj(values: pd.Series) -> pd.Series:
+    """
+    Flags CNPJs that are missing, have more than 14 digits, repeat a single digit
+    or have wrong check digits. Leading zeros may be missing, as in the sources.
+
+    Args:
+        values (pd.Series): The raw CNPJ values.
+
+    Returns:
+        pd.Series: A boolean mask of the invalid CNPJs.
+    """
+    digits = values.where(~is_missing(values), "").astype(str)
+    formatted = ~digits.str.isdigit() & (digits != "")
+
+    if formatted.any():
+        # numbers read as floats ("11222333000181.0") lose the decimal part first
+        digits.loc[formatted] = (digits.loc[formatted]
+                                 .str.replace(r"\.0+$", "", regex=True)
+                                 .str.replace(r"\D", "", regex=True))
+
+    lengths = digits.str.len()
+    candidates = (lengths > 0) & (lengths <= 14)
+    invalid = pd.Series(True, index=values.index)
+
+    if not candidates.any():
+        return invalid
+
+    # leading zeros come for free when the digits are extracted arithmetically
+    numbers = digits.loc[candidates].to_numpy().astype(np.int64)
+    matrix = numbers[:, None] // (10 ** np.arange(13, -1, -1, dtype=np.int64)) % 10
+
+    first_weights = np.array([5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2])
+    second_weights = np.array([6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2])
+
+    def check_digit(values: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        remainder = (values * weights).sum(axis=1) % 11
+
+        return np.where(remainder < 2, 0, 11 - remainder)
+
+    first = check_digit(matrix[:, :12], first_weights)
+    second = check_digit(matrix[:, :13], second_weights)
+    repeated = (matrix == matrix[:, :1]).all(axis=1)
+
+    valid = (matrix[:, 12] == first) & (matrix[:, 13] == second) & ~repeated
+    invalid.loc[candidates] = ~valid
+
+    return invalid
+
+
+def parsed_dates(values: pd.Series) -> pd.Series:
+    """
+    Parses dates with the fast ISO 8601 parser, falling back to per-value inference
+    only for the values it could not parse.
+    """
+    dates = pd.to_datetime(values, errors="coerce", format="ISO8601")
+    unparsed = dates.isna() & ~is_missing(values)
+
+    if unparsed.any():
+        dates.loc[unparsed] = pd.to_datetime(values.loc[unparsed], errors="coerce", format="mixed")
+
+    return dates
+
+
+def invalid_date(values: pd.Series,
+                 min_date: pd.Timestamp = MIN_DATE,
+                 max_date: Optional[pd.Timestamp] = None) -> pd.Series:
+    """
+    Flags dates that are present but cannot be parsed or fall outside [min_date, max_date].
+    Missing dates are not flagged. `max_date` defaults to today.
+    """
+    dates = parsed_dates(values)
+    upper = max_date if max_date is not None else pd.Timestamp.now()
+
+    return ~is_missing(values) & (dates.isna() | (dates < min_date) | (dates > upper))
+
+
+def end_before_start(start: pd.Series, end: pd.Series) -> pd.Series:
+    """
+    Flags rows whose end date comes before the start date. Rows missing either date are not flagged.
+    """
+    start_dates = parsed_dates(start)
+    end_dates = parsed_dates(end)
+
+    return (end_dates < start_dates).fillna(False)
+
+
+def invalid_amount(values: pd.Series) -> pd.Series:
+    """
+    Flags amounts that are present but are not numbers, or are negative.
+    """
+    numbers = pd.to_numeric(values, errors="coerce")
+
+    return ~is_missing(values) & (numbers.isna() | (numbers < 0))
+
+
+def collected_above_total(collected: pd.Series, total: pd.Series) -> pd.Series:
+    """
+    Flags rows whose collected amount is greater than the total amount.
+    """
+    collected_numbers = pd.to_numeric(collected, errors="coerce")
+    total_numbers = pd.to_numeric(total, errors="coerce")
+
+    return (collected_numbers > total_numbers).fillna(False)
+
+
+OSC_RULES = [
+    ValidationRule("cnpj", "CNPJ inválido",
+                   lambda dataset: invalid_cnpj(dataset[OngsDatasetCols.CNPJ])),
+    ValidationRule("foundation_date", "Data de fundação inválida",
+                   lambda dataset: invalid_date(dataset[OngsDatasetCols.DT_FUNDACAO_OSC],
+                                                min_date=pd.Timestamp("1800-01-01"))),
+]
+
+PROJECTS_RULES = [
+    ValidationRule("osc_cnpj", "CNPJ da OSC inválido",
+                   lambda dataset: invalid_cnpj(dataset[ProjectsDatasetCols.CD_IDENTIFICADOR_OSC])),
+    ValidationRule("start_date", "Data de início inválida",
+                   lambda dataset: invalid_date(dataset[ProjectsDatasetCols.DT_DATA_INICIO_PROJETO],
+                                                max_date=MAX_PROJECT_DATE)),
+    ValidationRule("end_date", "Data de término inválida",
+                   lambda dataset: invalid_date(dataset[ProjectsDatasetCols.DT_DATA_FIM_PROJETO],
+                                                max_date=MAX_PROJECT_DATE)),
+    ValidationRule("end_before_start", "Data de término anterior à data de início",
+                   lambda dataset: end_before_start(dataset[ProjectsDatasetCols.DT_DATA_INICIO_PROJETO],
+                                                    dataset[ProjectsDatasetCols.DT_DATA_FIM_PROJETO])),
+    ValidationRule("beneficiaries", "Total de beneficiários inválido",
+                   lambda dataset: invalid_amount(dataset[ProjectsDatasetCols.NR_TOTAL_BENEFICIARIOS])),
+    ValidationRule("collected_amount", "Valor captado inválido",
+                   lambda dataset: invalid_amount(dataset[ProjectsDatasetCols.NR_VALOR_CAPTADO_PROJETO])),
+    ValidationRule("total_amount", "Valor total inválido",
+                   lambda dataset: invalid_amount(dataset[ProjectsDatasetCols.NR_VALOR_TOTAL_PROJETO])),
+    ValidationRule("collected_above_total", "Valor captado maior que o valor total",
+                   lambda dataset: collected_above_total(dataset[ProjectsDatasetCols.NR_VALOR_CAPTADO_PROJETO],
+                                                         dataset[ProjectsDatasetCols.NR_VALOR_TOTAL_PROJETO])),
+]
+
+
+@instrumented()
+def validate(dataset: pd.DataFrame,
+             rules: list[ValidationRule]) -> tuple[pd.DataFrame, pd.DataFrame, dict]:
+    """
+    Evaluates every rule as a vectorized mask and splits the dataset into valid and quarantined rows.
+    Source lines skipped as malformed while reading (`attrs["skipped_lines"]`, see
+    `read_converted`) never reach the rules, so they are only reported in the summary.
+
+    Args:
+        dataset (pd.DataFrame): The raw dataset.
+        rules (list[ValidationRule]): The rules to be evaluated.
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame, dict]: The valid rows, the quarantined rows (with the
+            reasons in the "Motivos" column) and a summary with the failure counts per rule,
+            the skipped source lines and the time spent validating.
+    """
+    start = time.perf_counter()
+    skipped_lines = list(dataset.attrs.get("skipped_lines", []))
+    failures = pd.DataFrame({rule.name: rule.failures(dataset).to_numpy(dtype=bool)
+                             for rule in rules},
+                            index=dataset.index)
+    failed = failures.any(axis=1) if rules else pd.Series(False, index=dataset.index)
+
+    quarantine = dataset.loc[failed].copy()
+    reasons = pd.Series("", index=quarantine.index, dtype=object)
+
+    for rule in rules:
+        rule_failed = failures.loc[failed, rule.name]
+        reasons.loc[rule_failed] = reasons.loc[rule_failed] + "; " + rule.reason
+
+    quarantine[REASONS_COLUMN] = reasons.str.slice(2)
+
+    summary = {
+        "rows": len(dataset),
+        "valid": int((~failed).sum()),
+        "quarantined": int(failed.sum()),
+        "failures": {name: int(count) for name, count in failures.sum().items()},
+        "skipped_lines": len(skipped_lines),
+        "skipped_line_numbers": skipped_lines,
+        "seconds": time.perf_counter() - start,
+    }
+
+    return dataset.loc[~failed], quarantine, summary
+
+
+@instrumented()
+def write_quarantine(name: str,
+                     quarantine: pd.DataFrame,
+                     summary: dict) -> Optional[str]:
+    """
+    Writes the quarantined rows into a `.csv` file and the summary into a `.json` file,
+    next to the processed datasets.
+
+    Args:
+        name: the name of the validated dataset
+        quarantine: the quarantined rows, as returned by `validate`
+        summary: the validation summary, as returned by `validate`
+
+    Returns:
+        str: the path of the quarantine `.csv` file
+    """
+    try:
+        OUTPUT_SUFFIX = "-quarantine"
+        result_path = f"{DATASET_DIR}{name}{OUTPUT_SUFFIX}.csv"
+
+        quarantine.to_csv(result_path, sep=";", encoding="utf-8", index=False)
+
+        with open(f"{DATASET_DIR}{name}{OUTPUT_SUFFIX}.json", "w", encoding="utf-8") as output:
+            json.dump(summary, output, ensure_ascii=False, indent=2)
+
+        return result_path
+    except OSError:
+        return None
+
+
+def quarantine_invalid(name: str,
+                       dataset: pd.DataFrame,
+                       rules: list[ValidationRule]) -> pd.DataFrame:
+    """
+    Validation stage of the ETL: validates a raw dataset, writes the quarantined
+    rows and the summary next to the processed datasets and returns the valid rows.
+
+    Args:
+        name: the name of the validated dataset, used in the quarantine filenames
+        dataset: the raw dataset
+        rules: the rules to be evaluated
+
+    Returns:
+        pd.DataFrame: the rows that passed every rule
+    """
+    valid, quarantine, summary = validate(dataset, rules)
+    write_quarantine(name, quarantine, summary)
+
+    return valid
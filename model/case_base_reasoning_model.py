@@ -4,37 +4,75 @@ from sklearn.metrics.pairwise import euclidean_distances
 from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
 import numpy as np
+from data.instrumentation import instrumented
+from data.processing.text_features import text_vectorizer
 
 class CaseBasedReasoning:
-    def __init__(self, data, categorical_cols, numeric_cols, target_col):
+    def __init__(self, data, categorical_cols, numeric_cols, target_col, text_cols=None):
+        """
+        Parâmetros:
+        - data (pd.DataFrame): Base de casos.
+        - categorical_cols (list[str]): Atributos categóricos.
+        - numeric_cols (list[str]): Atributos numéricos.
+        - target_col (str): Atributo cujo valor será estimado.
+        - text_cols (list[str]): Atributos de texto livre, comparados por termos em comum (hashing).
+        """
         self.data = data.copy()
         self.categorical_cols = categorical_cols
         self.numeric_cols = numeric_cols
         self.target_col = target_col
+        self.text_cols = text_cols or []
         self.pipeline = None
         self.transformed_data = None
+        self._fitted = None
+        self.version = 0
 
+    @instrumented()
     def preprocess(self):
-        self.pipeline = ColumnTransformer(transformers=[
+        data = self.data
+        pipeline = ColumnTransformer(transformers=[
             ('cat', OneHotEncoder(handle_unknown='ignore'), self.categorical_cols),
-            ('num', StandardScaler(), self.numeric_cols)
+            ('num', StandardScaler(), self.numeric_cols),
+            *[(f'txt_{index}', text_vectorizer(), column)
+              for index, column in enumerate(self.text_cols)]
         ])
-        self.transformed_data = self.pipeline.fit_transform(self.data)
+        transformed_data = pipeline.fit_transform(data)
 
+        # trocados em uma única atribuição: `predict_batch` pode rodar em outra thread
+        # (CBRQueryService) e nunca deve misturar a base antiga com a nova
+        self._fitted = (data, pipeline, transformed_data)
+        self.pipeline, self.transformed_data = pipeline, transformed_data
+        self.version += 1
+
+    def update_cases(self, data):
+        self.data = data.copy()
+        self.preprocess()
+
+    @instrumented()
     def predict(self, new_case, k=3):
-        new_case_df = pd.DataFrame([new_case])
-        new_case_transformed = self.pipeline.transform(new_case_df)
+        return self.predict_batch([new_case], k)[0]
 
-        distances = euclidean_distances(new_case_transformed, self.transformed_data)[0]
-        nearest_indices = np.argsort(distances)[:k]
+    @instrumented()
+    def predict_batch(self, new_cases, k=3):
+        data, pipeline, transformed_data = self._fitted
+        new_cases_df = pd.DataFrame(list(new_cases))
+        new_cases_transformed = pipeline.transform(new_cases_df)
 
-        similar_cases_df = pd.DataFrame([
-            {**self.data.iloc[i].to_dict(), 'Distância': float(distances[i])}
-            for i in nearest_indices
-        ])
+        all_distances = euclidean_distances(new_cases_transformed, transformed_data)
+        all_nearest_indices = np.argsort(all_distances, axis=1)[:, :k]
+        target = data[self.target_col].astype(float).values
+
+        results = []
+
+        for distances, nearest_indices in zip(all_distances, all_nearest_indices):
+            similar_cases_df = pd.DataFrame([
+                {**data.iloc[i].to_dict(), 'Distância': float(distances[i])}
+                for i in nearest_indices
+            ])
+
+            weights = 1 / (distances[nearest_indices] + 1e-6)
+            predicted_value = np.average(target[nearest_indices], weights=weights)
 
-        target_values = self.data.iloc[nearest_indices][self.target_col].astype(float).values
-        weights = 1 / (distances[nearest_indices] + 1e-6)
-        predicted_value = np.average(target_values, weights=weights)
+            results.append((predicted_value, similar_cases_df))
 
-        return predicted_value, similar_cases_df
+        return results
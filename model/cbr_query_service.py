@@ -0,0 +1,253 @@
+import asyncio
+import re
+import time
+from collections import OrderedDict, deque
+
+
+class CBRQueryService:
+    """
+    Front-end assíncrono para consultas ao `CaseBasedReasoning`.
+
+    Consultas concorrentes são agrupadas em lotes e resolvidas com uma única
+    chamada vetorizada a `predict_batch`. Resultados ficam em um cache LRU,
+    indexado pelo caso normalizado e por `k`, que é descartado sempre que a
+    base de casos muda (`CaseBasedReasoning.version`).
+
+    Exemplo:
+        service = CBRQueryService(rbc)
+        predicted_value, similar_cases_df = await service.predict(new_case, k=3)
+        print(service.stats())
+    """
+
+    def __init__(self, cbr, max_batch_size=64, max_wait=0.002, cache_size=4096,
+                 latency_window=10_000):
+        """
+        Parâmetros:
+        - cbr (CaseBasedReasoning): Modelo já pré-processado (`preprocess`).
+        - max_batch_size (int): Número máximo de consultas resolvidas em um mesmo lote.
+        - max_wait (float): Tempo máximo, em segundos, de espera por mais consultas antes de resolver um lote.
+        - cache_size (int): Número máximo de resultados mantidos no cache LRU.
+        - latency_window (int): Número de latências recentes usadas nas estatísticas.
+        """
+        self.cbr = cbr
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.cache_size = cache_size
+
+        self._cache = OrderedDict()
+        self._cache_version = cbr.version
+        self._in_flight = {}
+        self._queue = None
+        self._worker = None
+
+        self._hits = 0
+        self._coalesced = 0
+        self._misses = 0
+        self._batches = 0
+        self._batched_queries = 0
+        self._latencies = deque(maxlen=latency_window)
+
+    def normalize_case(self, new_case):
+        """
+        Normaliza um caso para que consultas equivalentes compartilhem o mesmo resultado:
+        textos sem espaços extras e valores numéricos como float.
+
+        Parâmetros:
+        - new_case (dict): Caso a ser consultado.
+
+        Retorna:
+        - dict: O caso normalizado, somente com as colunas usadas pelo modelo.
+        """
+        normalized = {}
+
+        for column in self.cbr.categorical_cols:
+            value = new_case.get(column)
+            normalized[column] = (re.sub(r"\s+", " ", value).strip()
+                                  if isinstance(value, str) else value)
+
+        for column in self.cbr.numeric_cols:
+            normalized[column] = float(new_case.get(column, 0) or 0)
+
+        for column in self.cbr.text_cols:
+            normalized[column] = re.sub(r"\s+", " ", str(new_case.get(column) or "")).strip()
+
+        return normalized
+
+    async def predict(self, new_case, k=3):
+        """
+        Estima o valor alvo de um novo caso, como `CaseBasedReasoning.predict`.
+
+        Parâmetros:
+        - new_case (dict): Caso a ser consultado.
+        - k (int): Número de casos similares.
+
+        Retorna:
+        - tuple[float, pd.DataFrame]: O valor estimado e os casos mais similares.
+        """
+        start = time.perf_counter()
+        self._check_version()
+
+        normalized = self.normalize_case(new_case)
+        key = (tuple(normalized.items()), k)
+
+        if key in self._cache:
+            self._hits += 1
+            self._cache.move_to_end(key)
+            predicted_value, similar_cases_df = self._cache[key]
+        else:
+            future = self._in_flight.get(key)
+
+            if future is not None:
+                # an identical query is already queued: share its result
+                self._coalesced += 1
+            else:
+                self._misses += 1
+                future = asyncio.get_running_loop().create_future()
+                self._in_flight[key] = future
+                self._ensure_worker()
+                await self._queue.put((key, normalized, k, future))
+
+            predicted_value, similar_cases_df = await asyncio.shield(future)
+
+        self._latencies.append(time.perf_counter() - start)
+
+        return predicted_value, similar_cases_df.copy()
+
+    def stats(self):
+        """
+        Retorna estatísticas de uso do serviço.
+
+        Retorna:
+        - dict: Taxa de acerto, latências (média, p50, p95 e p99, em milissegundos)
+          e tamanho médio dos lotes. Consultas agrupadas a uma consulta idêntica em
+          andamento (`coalesced`) não são recalculadas e contam como acertos em `hit_rate`;
+          `cache_misses` é o número de consultas de fato calculadas.
+        """
+        queries = self._hits + self._coalesced + self._misses
+        latencies = sorted(self._latencies)
+
+        def percentile(fraction):
+            if not latencies:
+                return None
+
+            return latencies[min(int(fraction * len(latencies)), len(latencies) - 1)] * 1000
+
+        return {
+            "queries": queries,
+            "cache_hits": self._hits,
+            "coalesced": self._coalesced,
+            "cache_misses": self._misses,
+            "hit_rate": (self._hits + self._coalesced) / queries if queries else 0.0,
+            "cache_entries": len(self._cache),
+            "batches": self._batches,
+            "mean_batch_size": self._batched_queries / self._batches if self._batches else 0.0,
+            "latency_mean_ms": sum(latencies) / len(latencies) * 1000 if latencies else None,
+            "latency_p50_ms": percentile(0.50),
+            "latency_p95_ms": percentile(0.95),
+            "latency_p99_ms": percentile(0.99),
+        }
+
+    def clear_cache(self):
+        self._cache.clear()
+        self._in_flight.clear()
+        self._cache_version = self.cbr.version
+
+    async def close(self):
+        """
+        Encerra o processamento de lotes. Consultas pendentes são resolvidas antes.
+        """
+        if self._worker is None:
+            return
+
+        await self._queue.join()
+        self._worker.cancel()
+
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+
+        self._worker = None
+        self._queue = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def _check_version(self):
+        if self.cbr.version != self._cache_version:
+            self.clear_cache()
+
+    def _ensure_worker(self):
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._process_batches())
+
+    async def _process_batches(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+
+                if timeout <= 0:
+                    break
+
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                await self._resolve(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _resolve(self, batch):
+        loop = asyncio.get_running_loop()
+        version = self.cbr.version
+        by_k = {}
+
+        for entry in batch:
+            by_k.setdefault(entry[2], []).append(entry)
+
+        self._batches += 1
+        self._batched_queries += len(batch)
+
+        for k, entries in by_k.items():
+            try:
+                results = await loop.run_in_executor(
+                    None, self.cbr.predict_batch, [entry[1] for entry in entries], k)
+            except Exception as error:
+                for key, _, _, future in entries:
+                    self._in_flight.pop(key, None)
+
+                    if not future.done():
+                        future.set_exception(error)
+
+                continue
+
+            # a result computed against an older case base is returned, but never cached
+            cacheable = version == self.cbr.version == self._cache_version
+
+            for (key, _, _, future), result in zip(entries, results):
+                self._in_flight.pop(key, None)
+
+                if cacheable:
+                    self._store(key, result)
+
+                if not future.done():
+                    future.set_result(result)
+
+    def _store(self, key, result):
+        self._cache[key] = result
+        self._cache.move_to_end(key)
+
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
@@ -2,14 +2,15 @@ from .machine_learning_model import MachineLearningModel
 from sklearn.tree import DecisionTreeClassifier
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, confusion_matrix, ConfusionMatrixDisplay, precision_score, f1_score
-import matplotlib.pyplot as plt
 import pandas as pd
 import joblib
+from data.instrumentation import instrumented
 
 class DecisionTreeModel(MachineLearningModel):
     def __init__(self):
         self.model = DecisionTreeClassifier(random_state=42)
 
+    @instrumented()
     def load_data(self, file_path, target_column):
         """
         Carrega os dados de um arquivo CSV e separa em variáveis independentes (X) e alvo (y).
@@ -25,6 +26,7 @@ class DecisionTreeModel(MachineLearningModel):
         self.X = data.drop(target_column, axis=1)
         self.y = data[target_column]
 
+    @instrumented()
     def train(self):
         """
         Realiza a divisão dos dados em treino e teste, e treina o modelo Decision Tree com os dados de treino.
@@ -36,6 +38,7 @@ class DecisionTreeModel(MachineLearningModel):
             self.X, self.y, test_size=0.2, random_state=42)
         self.model.fit(self.X_train, self.y_train)
 
+    @instrumented()
     def evaluate(self):
         """
         Avalia o desempenho do modelo nos dados de teste.
@@ -49,6 +52,8 @@ class DecisionTreeModel(MachineLearningModel):
         Retorna:
         - None.
         """
+        import matplotlib.pyplot as plt
+
         y_pred = self.model.predict(self.X_test)
 
         accuracy = accuracy_score(self.y_test, y_pred)
@@ -66,6 +71,7 @@ class DecisionTreeModel(MachineLearningModel):
         plt.show()
 
 
+    @instrumented()
     def save_model(self, file_path):
         """
         Salva o modelo treinado em um arquivo utilizando a biblioteca joblib.
@@ -3,13 +3,15 @@ from sklearn.naive_bayes import GaussianNB
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, confusion_matrix, ConfusionMatrixDisplay, precision_score, f1_score
 import pandas as pd
+from scipy import sparse
 import joblib
-import matplotlib.pyplot as plt
+from data.instrumentation import instrumented
 
 class NaiveBayesModel(MachineLearningModel):
     def __init__(self):
         self.model = GaussianNB()
 
+    @instrumented()
     def load_data(self, file_path, target_column):
         """
         Carrega os dados de um arquivo CSV e separa em variáveis independentes (X) e alvo (y).
@@ -25,17 +27,30 @@ class NaiveBayesModel(MachineLearningModel):
         self.X = data.drop(target_column, axis=1)
         self.y = data[target_column]
 
+    @instrumented()
     def train(self):
         """
         Realiza a divisão dos dados em treino e teste, e treina o modelo Naive Bayes com os dados de treino.
 
+        O GaussianNB não aceita matrizes esparsas, e convertê-las em densas ocuparia
+        gigabytes com os atributos de texto. Eles devem ser reduzidos antes, por uma
+        etapa `TextReduction` (veja `load_model(name, text_components)`).
+
+        Exceções:
+        - ValueError: Se self.X for esparsa e o modelo não tiver uma etapa de redução.
+
         Retorna:
         - None. O modelo treinado é armazenado em self.model.
         """
+        if sparse.issparse(self.X) and isinstance(self.model, GaussianNB):
+            raise ValueError("O GaussianNB não aceita matrizes esparsas: "
+                             "reduza os atributos de texto (text_components).")
+
         self.X_train, self.X_test, self.y_train, self.y_test = train_test_split(
             self.X, self.y, test_size=0.2, random_state=42)
         self.model.fit(self.X_train, self.y_train)
 
+    @instrumented()
     def evaluate(self):
         """
         Avalia o desempenho do modelo nos dados de teste.
@@ -49,6 +64,8 @@ class NaiveBayesModel(MachineLearningModel):
         Retorna:
         - None.
         """
+        import matplotlib.pyplot as plt
+
         y_pred = self.model.predict(self.X_test)
 
         accuracy = accuracy_score(self.y_test, y_pred)
@@ -66,6 +83,7 @@ class NaiveBayesModel(MachineLearningModel):
         plt.show()
 
 
+    @instrumented()
     def save_model(self, file_path):
         """
         Salva o modelo treinado em um arquivo utilizando a biblioteca joblib.
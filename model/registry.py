@@ -0,0 +1,62 @@
+import importlib
+
+
+# importados sob demanda, para que a listagem dos modelos não carregue o scikit-learn
+MODELS = {
+    "decision-tree": ("model.decision_tree_model", "DecisionTreeModel"),
+    "naive-bayes": ("model.naive_bayes_model", "NaiveBayesModel"),
+    "svm": ("model.svm_model", "SVMModel"),
+}
+
+
+# modelos que não aceitam matrizes esparsas (atributos de texto sem redução)
+DENSE_ONLY_MODELS = {"naive-bayes"}
+
+
+def load_model(name, text_components=None, text_n_features=None):
+    """
+    Importa e instancia um modelo pelo seu nome.
+
+    Parâmetros:
+    - name (str): Uma das chaves de `MODELS`.
+    - text_components (int): Se definido, os atributos de texto (`text_classifier_features`)
+      são reduzidos a este número de dimensões por uma etapa `TextReduction`, ajustada
+      junto com o modelo, somente nos dados de treino, e salva com ele.
+    - text_n_features (int): Número de colunas de texto (o `n_features` usado em
+      `text_classifier_features`). Por padrão, `DEFAULT_N_FEATURES`.
+
+    Retorna:
+    - MachineLearningModel: Uma nova instância do modelo, ainda não treinada.
+    """
+    module_name, class_name = MODELS[name]
+    model_class = getattr(importlib.import_module(module_name), class_name)
+    model = model_class()
+
+    if text_components is not None:
+        from sklearn.pipeline import Pipeline
+        from data.processing.text_features import DEFAULT_N_FEATURES, TextReduction
+
+        reduction = TextReduction(text_components, text_n_features or DEFAULT_N_FEATURES)
+        model.model = Pipeline([("text_reduction", reduction),
+                                ("classifier", model.model)])
+
+    return model
+
+
+def check_text_options(names, text_features, text_components):
+    """
+    Verifica, antes do treino, se os modelos aceitam os atributos de texto pedidos.
+
+    Parâmetros:
+    - names (list[str]): Chaves de `MODELS`.
+    - text_features (bool): Se os atributos de texto serão usados.
+    - text_components (int): Número de dimensões dos atributos de texto, ou None (esparsos).
+
+    Exceções:
+    - ValueError: Se um modelo que só aceita matrizes densas receber atributos de texto sem redução.
+    """
+    dense_only = [name for name in names if name in DENSE_ONLY_MODELS]
+
+    if text_features and text_components is None and dense_only:
+        raise ValueError("Sem redução (--text-components), os atributos de texto são esparsos, "
+                         f"o que não é aceito por: {', '.join(dense_only)}.")
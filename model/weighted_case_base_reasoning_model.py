@@ -0,0 +1,221 @@
+import numpy as np
+import pandas as pd
+from .case_base_reasoning_model import CaseBasedReasoning
+from data.instrumentation import instrumented
+
+
+class WeightedCaseBasedReasoning(CaseBasedReasoning):
+    """
+    RBC com pesos por atributo e similaridade por sobreposição de conjuntos.
+
+    Diferente de `CaseBasedReasoning`, os atributos categóricos não são expandidos
+    em one-hot: cada atributo contribui com uma única distância em [0, 1], multiplicada
+    pelo seu peso. Assim, atributos com muitas categorias (como 'Município') não
+    dominam a distância.
+
+    - Atributos categóricos comuns: distância 0 se iguais, 1 caso contrário.
+    - Atributos de conjunto (como 'Áreas de Atuação', "A, B, C"): distância de Jaccard
+      entre os conjuntos, pré-calculada em uma tabela entre todos os valores distintos.
+    - Atributos numéricos: diferença entre os valores padronizados.
+
+    A distância final é sqrt(soma(peso * distância²)). Cada consulta se resume a
+    consultas às tabelas e a um pequeno termo numérico.
+    """
+
+    def __init__(self, data, categorical_cols, numeric_cols, target_col,
+                 weights=None, set_cols=None, set_separator=","):
+        """
+        Parâmetros:
+        - data (pd.DataFrame): Base de casos.
+        - categorical_cols (list[str]): Atributos categóricos, incluindo os de conjunto.
+        - numeric_cols (list[str]): Atributos numéricos.
+        - target_col (str): Atributo cujo valor será estimado.
+        - weights (dict[str, float]): Peso de cada atributo. Atributos ausentes têm peso 1.
+        - set_cols (list[str]): Atributos categóricos comparados por sobreposição de conjuntos.
+        - set_separator (str): Separador dos elementos nos atributos de conjunto.
+
+        Exceções:
+        - ValueError: Se `weights` ou `set_cols` citarem atributos que não estão em
+          `categorical_cols` ou `numeric_cols`.
+        """
+        super().__init__(data, categorical_cols, numeric_cols, target_col)
+
+        attributes = [*categorical_cols, *numeric_cols]
+        unknown_weights = [column for column in (weights or {}) if column not in attributes]
+        unknown_sets = [column for column in (set_cols or []) if column not in categorical_cols]
+
+        if unknown_weights:
+            raise ValueError(f"Atributos desconhecidos em weights: {', '.join(unknown_weights)}. "
+                             f"Atributos: {', '.join(attributes)}")
+
+        if unknown_sets:
+            raise ValueError(f"Atributos desconhecidos em set_cols: {', '.join(unknown_sets)}. "
+                             f"Atributos categóricos: {', '.join(categorical_cols)}")
+
+        self.weights = weights or {}
+        self.set_cols = set_cols or []
+        self.set_separator = set_separator
+
+        self.codes = {}
+        self.categories = {}
+        self.distance_tables = {}
+        self.numeric_mean = None
+        self.numeric_scale = None
+        self.numeric_data = None
+
+    def weight(self, column):
+        return float(self.weights.get(column, 1.0))
+
+    def as_set(self, value):
+        if not isinstance(value, str):
+            return frozenset()
+
+        return frozenset(item.strip()
+                         for item in value.split(self.set_separator)
+                         if item.strip())
+
+    def set_distances(self, value, categories):
+        """
+        Calcula a distância de Jaccard entre um valor e cada uma das categorias de um atributo de conjunto.
+
+        Parâmetros:
+        - value (str): Valor do atributo, com elementos separados por `set_separator`.
+        - categories (list[frozenset]): Categorias distintas do atributo, já convertidas em conjuntos.
+
+        Retorna:
+        - np.ndarray: Distâncias em [0, 1], na ordem de `categories`.
+        """
+        value_set = self.as_set(value)
+        distances = np.empty(len(categories), dtype=np.float64)
+
+        for index, category in enumerate(categories):
+            union = len(value_set | category)
+            distances[index] = 1.0 - (len(value_set & category) / union if union else 1.0)
+
+        return distances
+
+    @instrumented()
+    def preprocess(self):
+        """
+        Codifica os atributos categóricos, pré-calcula as tabelas de distância dos
+        atributos de conjunto e padroniza os atributos numéricos.
+
+        Retorna:
+        - None. As estruturas ficam armazenadas no modelo.
+        """
+        data = self.data
+        codes = {}
+        categories = {}
+        distance_tables = {}
+
+        for column in self.categorical_cols:
+            column_codes, column_categories = pd.factorize(data[column])
+            codes[column] = column_codes
+            categories[column] = pd.Index(column_categories)
+
+            if column in self.set_cols:
+                category_sets = [self.as_set(category) for category in column_categories]
+                distance_tables[column] = np.vstack(
+                    [self.set_distances(category, category_sets) for category in column_categories]
+                ) if len(column_categories) else np.empty((0, 0))
+
+        numeric = data[self.numeric_cols].astype(float).values
+        numeric_mean = numeric.mean(axis=0)
+        numeric_scale = numeric.std(axis=0)
+        numeric_scale[numeric_scale == 0] = 1.0
+
+        fitted = {
+            "data": data,
+            "codes": codes,
+            "categories": categories,
+            "distance_tables": distance_tables,
+            "numeric_mean": numeric_mean,
+            "numeric_scale": numeric_scale,
+            "numeric_data": (numeric - numeric_mean) / numeric_scale,
+        }
+
+        # trocados em uma única atribuição, como em `CaseBasedReasoning.preprocess`
+        self._fitted = fitted
+        self.codes, self.categories, self.distance_tables = codes, categories, distance_tables
+        self.numeric_mean, self.numeric_scale = numeric_mean, numeric_scale
+        self.numeric_data = fitted["numeric_data"]
+
+        self.version += 1
+
+    def distances(self, new_cases_df, fitted=None):
+        """
+        Calcula a distância ponderada entre cada novo caso e todos os casos da base.
+
+        Parâmetros:
+        - new_cases_df (pd.DataFrame): Novos casos, um por linha.
+        - fitted (dict): Estado pré-processado a ser usado. Por padrão, o estado atual do modelo.
+
+        Retorna:
+        - np.ndarray: Matriz (novos casos x casos da base) de distâncias.
+        """
+        fitted = fitted if fitted is not None else self._fitted
+        squared = np.zeros((len(new_cases_df), len(fitted["data"])), dtype=np.float64)
+
+        for column in self.categorical_cols:
+            codes = fitted["codes"][column]
+            column_categories = fitted["categories"][column]
+            query_codes = column_categories.get_indexer(new_cases_df[column])
+
+            if column in self.set_cols:
+                table = fitted["distance_tables"][column]
+                category_sets = None
+
+                for row, (query_code, value) in enumerate(zip(query_codes, new_cases_df[column])):
+                    if query_code >= 0:
+                        category_distances = table[query_code]
+                    else:
+                        # unseen combination: compare against every known one once
+                        if category_sets is None:
+                            category_sets = [self.as_set(category)
+                                             for category in column_categories]
+                        category_distances = self.set_distances(value, category_sets)
+
+                    # missing values in the case base (code -1) index the appended 1.0
+                    category_distances = np.append(category_distances, 1.0)
+                    squared[row] += self.weight(column) * category_distances[codes] ** 2
+            else:
+                mismatch = ((query_codes[:, None] != codes[None, :])
+                            | (query_codes[:, None] < 0))
+                squared += self.weight(column) * mismatch
+
+        numeric = new_cases_df[self.numeric_cols].astype(float).values
+        scaled = (numeric - fitted["numeric_mean"]) / fitted["numeric_scale"]
+
+        for index, column in enumerate(self.numeric_cols):
+            difference = scaled[:, index][:, None] - fitted["numeric_data"][:, index][None, :]
+            squared += self.weight(column) * difference ** 2
+
+        return np.sqrt(squared)
+
+    @instrumented()
+    def predict_batch(self, new_cases, k=3):
+        fitted = self._fitted
+        data = fitted["data"]
+        new_cases_df = pd.DataFrame(list(new_cases))
+        all_distances = self.distances(new_cases_df, fitted)
+        target = data[self.target_col].astype(float).values
+        k = min(k, len(data))
+
+        results = []
+
+        for distances in all_distances:
+            candidates = np.argpartition(distances, k - 1)[:k]
+            nearest_indices = candidates[np.argsort(distances[candidates], kind="stable")]
+
+            similar_cases_df = (
+                data.iloc[nearest_indices]
+                .assign(**{'Distância': distances[nearest_indices]})
+                .reset_index(drop=True)
+            )
+
+            weights = 1 / (distances[nearest_indices] + 1e-6)
+            predicted_value = np.average(target[nearest_indices], weights=weights)
+
+            results.append((predicted_value, similar_cases_df))
+
+        return results
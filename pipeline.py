@@ -0,0 +1,352 @@
+"""
+Resumable pipeline runner for the ETL and the model training.
+
+Each stage stores its output as a checkpoint and is recorded in a run manifest,
+together with a fingerprint of its inputs (source file hashes, parameters and
+the fingerprints of the stages it depends on). A rerun skips every stage whose
+fingerprint is unchanged and whose checkpoint exists, so it resumes from the
+first stage that did not finish or whose inputs changed.
+
+Stages, in order:
+    transcode_osc, transcode_projects, osc_dataset, projects_dataset,
+    features, train[<model>] (one per model)
+
+Stages run one at a time. Each source is transcoded by its own stage, so a change
+to one source reruns only its conversion, at the cost of the concurrent conversion
+done by `etl` (`transcode_sources`).
+
+Usage:
+    python cli.py run
+    python cli.py run --from projects_dataset
+    python cli.py run --only train[svm]
+"""
+import hashlib
+import json
+import os
+import pickle
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, NamedTuple, Optional
+
+from data.constants.dataset_constants import DATASET_DIR, OSC_DATASET, PROJECTS_DATASET
+from model.registry import MODELS, check_text_options, load_model
+
+
+CHECKPOINT_DIR = DATASET_DIR + ".checkpoints/"
+MANIFEST_PATH = CHECKPOINT_DIR + "manifest.json"
+
+
+class PipelineStage(NamedTuple):
+    """
+    A pipeline stage. `run` receives the outputs of `inputs` (in order) and returns
+    the stage output, which is stored as the stage checkpoint.
+    `sources` are raw files, inside the datasets directory, whose content is part of the fingerprint.
+    """
+    name: str
+    inputs: list[str]
+    run: Callable[..., Any]
+    params: dict
+    sources: list[str]
+
+
+def transcode(filename: str, separator: Optional[str], input_encoding: str):
+    from data.processing.data_parser import read_converted, to_utf8
+
+    parsed_source = to_utf8(filename, separator, input_encoding)
+
+    if parsed_source is None:
+        raise FileNotFoundError(
+            f"File {filename} not found or could not be converted to UTF-8.")
+
+    return read_converted(parsed_source)
+
+
+def build_osc_dataset(osc_source, validate_sources: bool, workers: Optional[int]):
+    from data.processing.data_parser import write_dataset
+    from data.processing.osc import osc_dataset
+    from data.processing.validation import OSC_RULES, quarantine_invalid
+
+    if validate_sources:
+        osc_source = quarantine_invalid("osc", osc_source, OSC_RULES)
+
+    osc_df = osc_dataset(osc_source, workers)
+    write_dataset("osc", osc_df)
+
+    return osc_df
+
+
+def build_projects_dataset(projects_source, osc_df, validate_sources: bool, workers: Optional[int]):
+    from data.processing.data_parser import write_dataset
+    from data.processing.projects import projects_dataset
+    from data.processing.validation import PROJECTS_RULES, quarantine_invalid
+
+    if validate_sources:
+        projects_source = quarantine_invalid("projects", projects_source, PROJECTS_RULES)
+
+    projects_df = projects_dataset(projects_source, osc_df, workers)
+
+    if projects_df is None:
+        raise ValueError("No projects left after filtering by region.")
+
+    write_dataset("projects", projects_df)
+
+    return projects_df
+
+
+def build_features(projects_df, text_features: bool, text_n_features: Optional[int],
+                   workers: Optional[int]):
+    from data.processing.features import classifier_features, text_classifier_features
+    from data.processing.text_features import DEFAULT_N_FEATURES
+
+    if text_features:
+        return text_classifier_features(projects_df, text_n_features or DEFAULT_N_FEATURES,
+                                        workers=workers)
+
+    return classifier_features(projects_df)
+
+
+def train_model(name: str, features, text_components: Optional[int],
+                text_n_features: Optional[int]):
+    model = load_model(name, text_components, text_n_features)
+    model.X, model.y = features
+    model.train()
+
+    return model
+
+
+def pipeline_stages(osc_filename: str = OSC_DATASET,
+                    projects_filename: str = PROJECTS_DATASET,
+                    models: Optional[list[str]] = None,
+                    validate_sources: bool = True,
+                    workers: Optional[int] = None,
+                    text_features: bool = False,
+                    text_components: Optional[int] = None,
+                    text_n_features: Optional[int] = None) -> list[PipelineStage]:
+    """
+    Declares the pipeline stages, in execution order.
+
+    Args:
+        osc_filename (str): The raw OSC dataset filename, inside the datasets directory.
+        projects_filename (str): The raw projects dataset filename, inside the datasets directory.
+        models (Optional[list[str]]): The models to be trained (keys of `MODELS`). Defaults to all.
+        validate_sources (bool): Whether to quarantine the rows failing validation.
+        workers (Optional[int]): The number of worker processes. Not part of the fingerprints,
+            since the output does not depend on it.
+        text_features (bool): Whether the features include hashed project names and descriptions.
+        text_components (Optional[int]): Reduces the text features to this many dimensions,
+            fitted with each model on its training split.
+        text_n_features (Optional[int]): The number of hash buckets for the texts, shared by
+            the features and the text reduction of the models. Defaults to `DEFAULT_N_FEATURES`.
+
+    Returns:
+        list[PipelineStage]: The stages.
+    """
+    models = models or list(MODELS)
+    check_text_options(models, text_features, text_components)
+    text_components = text_components if text_features else None
+
+    stages = [
+        PipelineStage("transcode_osc", [],
+                      lambda: transcode(osc_filename, ";", "latin1"),
+                      {"separator": ";", "input_encoding": "latin1"},
+                      [osc_filename]),
+        PipelineStage("transcode_projects", [],
+                      lambda: transcode(projects_filename, None, "utf-8"),
+                      {"separator": None, "input_encoding": "utf-8"},
+                      [projects_filename]),
+        PipelineStage("osc_dataset", ["transcode_osc"],
+                      lambda osc_source: build_osc_dataset(osc_source, validate_sources, workers),
+                      {"validate_sources": validate_sources},
+                      []),
+        PipelineStage("projects_dataset", ["transcode_projects", "osc_dataset"],
+                      lambda projects_source, osc_df: build_projects_dataset(
+                          projects_source, osc_df, validate_sources, workers),
+                      {"validate_sources": validate_sources},
+                      []),
+        PipelineStage("features", ["projects_dataset"],
+                      lambda projects_df: build_features(
+                          projects_df, text_features, text_n_features, workers),
+                      {"text_features": text_features, "text_n_features": text_n_features},
+                      []),
+    ]
+
+    for name in models:
+        stages.append(PipelineStage(f"train[{name}]", ["features"],
+                                    lambda features, name=name: train_model(
+                                        name, features, text_components, text_n_features),
+                                    {"model": name, "text_components": text_components,
+                                     "text_n_features": text_n_features},
+                                    []))
+
+    return stages
+
+
+def fingerprints(stages: list[PipelineStage]) -> dict[str, str]:
+    """
+    Computes the fingerprint of each stage: a hash of its name, parameters, source file
+    contents and the fingerprints of its inputs. A change anywhere upstream changes the
+    fingerprint of every stage that depends on it.
+    """
+    from data.processing.data_parser import dataset_path
+    from data.processing.ingestion import file_hash
+
+    result = {}
+
+    for stage in stages:
+        source_hashes = []
+
+        for source in stage.sources:
+            full_path = dataset_path(source)
+            source_hashes.append(file_hash(full_path) if full_path else None)
+
+        payload = json.dumps({
+            "stage": stage.name,
+            "params": stage.params,
+            "sources": source_hashes,
+            "inputs": [result[name] for name in stage.inputs],
+        }, sort_keys=True)
+
+        result[stage.name] = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    return result
+
+
+def checkpoint_path(stage_name: str) -> str:
+    safe_name = stage_name.replace("[", "-").replace("]", "")
+
+    return f"{CHECKPOINT_DIR}{safe_name}.pkl"
+
+
+def read_manifest() -> dict:
+    if not os.path.exists(MANIFEST_PATH):
+        return {"stages": {}}
+
+    with open(MANIFEST_PATH, encoding="utf-8") as manifest_file:
+        return json.load(manifest_file)
+
+
+def write_manifest(manifest: dict) -> None:
+    partial_path = f"{MANIFEST_PATH}.tmp"
+
+    with open(partial_path, "w", encoding="utf-8") as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+
+    os.replace(partial_path, MANIFEST_PATH)
+
+
+def write_checkpoint(stage_name: str, output: Any) -> str:
+    path = checkpoint_path(stage_name)
+    partial_path = f"{path}.tmp"
+
+    with open(partial_path, "wb") as checkpoint_file:
+        pickle.dump(output, checkpoint_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    os.replace(partial_path, path)
+
+    return path
+
+
+def read_checkpoint(stage_name: str) -> Any:
+    with open(checkpoint_path(stage_name), "rb") as checkpoint_file:
+        return pickle.load(checkpoint_file)
+
+
+def is_complete(manifest: dict, stage_name: str, fingerprint: str) -> bool:
+    entry = manifest["stages"].get(stage_name)
+
+    return (entry is not None
+            and entry.get("status") == "completed"
+            and entry.get("fingerprint") == fingerprint
+            and os.path.exists(checkpoint_path(stage_name)))
+
+
+def run_pipeline(from_stage: Optional[str] = None,
+                 only: Optional[str] = None,
+                 stages: Optional[list[PipelineStage]] = None) -> dict[str, str]:
+    """
+    Runs the pipeline, resuming from the first stage that did not finish or whose inputs changed.
+
+    Args:
+        from_stage (Optional[str]): Reruns this stage and every stage after it, even if up to date.
+        only (Optional[str]): Runs only this stage, reading its inputs from their checkpoints.
+            The inputs must be up to date; a stale input raises ValueError.
+        stages (Optional[list[PipelineStage]]): The stages to run. Defaults to `pipeline_stages()`.
+
+    Returns:
+        dict[str, str]: The status of each stage in this run ("completed" or "skipped").
+    """
+    stages = stages if stages is not None else pipeline_stages()
+    names = [stage.name for stage in stages]
+
+    for requested in (from_stage, only):
+        if requested is not None and requested not in names:
+            raise ValueError(f"Unknown stage {requested!r}. Stages: {', '.join(names)}")
+
+    os.makedirs(CHECKPOINT_DIR, exist_ok=True)
+
+    stage_fingerprints = fingerprints(stages)
+    manifest = read_manifest()
+    manifest["run_started_at"] = datetime.now(timezone.utc).isoformat()
+    outputs: dict[str, Any] = {}
+    statuses: dict[str, str] = {}
+    forced = False
+
+    if only is not None:
+        only_stage = stages[names.index(only)]
+        stale = [name for name in only_stage.inputs
+                 if not is_complete(manifest, name, stage_fingerprints[name])]
+
+        if stale:
+            raise ValueError(
+                f"Inputs of stage {only!r} are missing or out of date: {', '.join(stale)}. "
+                f"Run `--from {stale[0]}` or a full run first.")
+
+    def output_of(stage_name: str) -> Any:
+        if stage_name not in outputs:
+            if not os.path.exists(checkpoint_path(stage_name)):
+                raise FileNotFoundError(
+                    f"Checkpoint of stage {stage_name!r} not found. Run it first.")
+
+            outputs[stage_name] = read_checkpoint(stage_name)
+
+        return outputs[stage_name]
+
+    for stage in stages:
+        forced = forced or stage.name == from_stage
+
+        if only is not None and stage.name != only:
+            continue
+
+        fingerprint = stage_fingerprints[stage.name]
+
+        if (only is None and not forced
+                and is_complete(manifest, stage.name, fingerprint)):
+            statuses[stage.name] = "skipped"
+            print(f"[{stage.name}] up to date, skipping")
+            continue
+
+        print(f"[{stage.name}] running...")
+        start = time.perf_counter()
+        manifest["stages"][stage.name] = {"status": "running", "fingerprint": fingerprint}
+        write_manifest(manifest)
+
+        try:
+            output = stage.run(*[output_of(name) for name in stage.inputs])
+        except BaseException as error:
+            manifest["stages"][stage.name].update(status="failed", error=repr(error))
+            write_manifest(manifest)
+            raise
+
+        outputs[stage.name] = output
+        manifest["stages"][stage.name] = {
+            "status": "completed",
+            "fingerprint": fingerprint,
+            "checkpoint": write_checkpoint(stage.name, output),
+            "inputs": stage.inputs,
+            "seconds": time.perf_counter() - start,
+            "completed_at": datetime.now(timezone.utc).isoformat(),
+        }
+        write_manifest(manifest)
+        statuses[stage.name] = "completed"
+
+    return statuses